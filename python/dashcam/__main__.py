@@ -1,14 +1,10 @@
 """
 Package entrypoint for `python -m dashcam`.
 
-This module forwards execution to the top-level `dashcam.py` script
-so the package can be executed as a module when run under systemd
-or with `python -m dashcam`.
+Imports the application from `dashcam.app` so the package can be
+executed as a module when run under systemd or with `python -m dashcam`.
 """
-from runpy import run_path
-import os
-
-SCRIPT_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'dashcam.py'))
+from dashcam.app import main
 
 if __name__ == '__main__':
-    run_path(SCRIPT_PATH, run_name='__main__')
+    main()
@@ -0,0 +1,555 @@
+"""
+Active Dash Mirror - Main Application
+Raspberry Pi 5 Dashcam System with Dual CSI Cameras
+"""
+
+import sys
+import os
+import atexit
+import queue
+import signal
+import logging
+import time
+import threading
+from logging.handlers import QueueHandler, QueueListener, SysLogHandler, TimedRotatingFileHandler
+
+from dashcam.core.config import get_config
+from dashcam.core.gps_handler import GPSHandler
+
+# None of our formats use thread/process fields; skip collecting them per record
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
+
+
+class DashcamSystem:
+    """Main dashcam system coordinator"""
+    
+    def __init__(self):
+        self.config = get_config()
+        self.logger = None
+        self._log_listener = None
+        self._log_queue_handler = None
+        self.running = False
+        self._wake = threading.Event()  # Set to cut the main loop's sleep short
+        self._status_thread = None
+        self.status_interval = 30.0  # Log status every 30 seconds
+        
+        # Components
+        self.display = None
+        self.recorder = None
+        self.gps = None
+        self.canbus = None
+        self.next_gps_retry = 0.0
+        self.last_movement_time = None
+        self._last_pushed_speed = object()  # Sentinel: nothing pushed yet
+        
+        # Setup logging
+        self._setup_logging()
+        
+        # Register signal handlers
+        signal.signal(signal.SIGINT, self._signal_handler)
+        signal.signal(signal.SIGTERM, self._signal_handler)
+        
+    def _setup_logging(self):
+        """Configure logging system"""
+        # Validate config
+        self.config.validate()
+        
+        # Create logger
+        self.logger = logging.getLogger()
+        self.logger.setLevel(getattr(logging, self.config.log_level))
+        handlers = []
+        # One formatter shared by the console and file handlers
+        formatter = logging.Formatter(
+            '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+            datefmt='%Y-%m-%d %H:%M:%S'
+        )
+        
+        # Console handler (if enabled)
+        if self.config.log_to_console:
+            console_handler = logging.StreamHandler(sys.stdout)
+            console_handler.setLevel(logging.INFO)
+            console_handler.setFormatter(formatter)
+            handlers.append(console_handler)
+        
+        # Persistent log: journald via syslog, or a file rolled over at midnight
+        backend_warning = None
+        log_handler = None
+        if self.config.log_backend == "syslog":
+            if os.path.exists('/dev/log'):
+                log_handler = SysLogHandler(address='/dev/log', facility=SysLogHandler.LOG_DAEMON)
+                log_handler.setFormatter(logging.Formatter(
+                    'dashcam: %(name)s - %(levelname)s - %(message)s'
+                ))
+            else:
+                backend_warning = "Syslog socket /dev/log not found; falling back to file"
+        elif self.config.log_backend != "file":
+            backend_warning = f"Unknown log backend '{self.config.log_backend}'; using file"
+        
+        if log_handler is None:
+            log_file = os.path.join(self.config.log_dir, "dashcam.log")
+            log_handler = TimedRotatingFileHandler(
+                log_file,
+                when='midnight',
+                backupCount=self.config.log_backup_count
+            )
+            log_handler.setFormatter(formatter)
+        log_handler.setLevel(logging.DEBUG)
+        handlers.append(log_handler)
+        
+        # Callers only enqueue records; a listener thread does the console
+        # and SD card writes so slow flash never stalls the main loop
+        log_queue = queue.SimpleQueue()
+        self._log_listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        self._log_listener.start()
+        self._log_queue_handler = QueueHandler(log_queue)
+        self.logger.addHandler(self._log_queue_handler)
+        # Stopped only at exit: threads still winding down after stop(), or a
+        # later start(), keep logging through the same queue
+        atexit.register(self._stop_log_listener)
+        
+        self.logger.info("=" * 60)
+        self.logger.info("Active Dash Mirror - Starting")
+        self.logger.info("Dual CSI Camera System")
+        self.logger.info("=" * 60)
+        if backend_warning:
+            self.logger.warning(backend_warning)
+    
+    def start(self):
+        """Start dashcam system"""
+        cfg = self.config
+        # A previous stop() leaves _wake set; clear it so the main loop and
+        # status thread of this run wait normally again
+        self._wake.clear()
+        try:
+            self.logger.info("Initializing dashcam system...")
+            
+            # Startup delay (let system stabilize)
+            if cfg.startup_delay > 0:
+                self.logger.info(f"Waiting {cfg.startup_delay}s for system to stabilize...")
+                time.sleep(cfg.startup_delay)
+            
+            # Log configuration
+            self._log_configuration()
+            
+            # Initialize display (import lazily to avoid circular imports)
+            self.logger.info("Starting display...")
+            backend = cfg.display_backend
+            try:
+                if backend == "drm":
+                    from dashcam.platforms.pi5_arducam.video_display_drmkms import DrmKmsDisplay
+
+                    card_path = cfg.display_drm_card
+                    self.logger.info(f"Using DRM/KMS display backend (card={card_path})")
+                    self.display = DrmKmsDisplay(cfg, card_path=card_path)
+                else:
+                    from dashcam.platforms.pi5_arducam.video_display import VideoDisplay
+
+                    self.logger.info("Using fbdev display backend (/dev/fb0)")
+                    self.display = VideoDisplay(cfg)
+            except Exception as e:
+                self.logger.error(f"Failed to initialize display backend '{backend}': {e}")
+                raise
+
+            if not self.display.start():
+                raise RuntimeError("Failed to start display")
+
+            # Initialize CAN bus (if enabled)
+            if cfg.canbus_enabled:
+                self.logger.info("Starting CAN bus...")
+                try:
+                    from dashcam.canbus.vehicles.camaro_2013_lfx import create_camaro_canbus, CANChannel
+
+                    channel_map = {"can0": CANChannel.CAN0, "can1": CANChannel.CAN1}
+                    channel = channel_map.get(str(cfg.canbus_channel).lower(), CANChannel.CAN0)
+
+                    if cfg.canbus_vehicle_type != "camaro_2013_lfx":
+                        self.logger.warning(
+                            f"CAN vehicle '{cfg.canbus_vehicle_type}' not supported yet; skipping CAN startup"
+                        )
+                    else:
+                        self.canbus = create_camaro_canbus(cfg, channel=channel)
+                        if not self.canbus.start():
+                            self.logger.warning("CAN bus failed to start; continuing without CAN")
+                            self.canbus = None
+                        elif self.display and cfg.display_canbus_data:
+                            try:
+                                self.display.set_canbus_vehicle(self.canbus)
+                            except Exception as e:
+                                self.logger.warning(f"Failed to link CAN bus to display: {e}")
+                except Exception as e:
+                    self.logger.error(f"Failed to initialize CAN bus: {e}")
+                    self.canbus = None
+            
+            # Initialize GPS (if enabled)
+            if cfg.gps_enabled:
+                self.logger.info("Starting GPS...")
+                self.gps = GPSHandler(cfg)
+                if not self.gps.start():
+                    if cfg.gps_required:
+                        raise RuntimeError("GPS is required but failed to start")
+                    else:
+                        self.logger.warning("GPS failed to start, will retry in background")
+                        self.gps = None
+                        self.next_gps_retry = time.monotonic() + cfg.gps_retry_delay
+            else:
+                self.logger.info("GPS disabled in configuration")
+                self.gps = None
+            
+            # Link GPS to display if both are available
+            if self.gps and self.display:
+                self.logger.info("Linking GPS to display for speed overlay")
+            
+            # Initialize video recorder (import lazily to avoid circular imports)
+            self.logger.info("Starting video recorder...")
+            from dashcam.platforms.pi5_arducam.video_recorder import VideoRecorder
+            self.recorder = VideoRecorder(cfg, self.display)
+            if not self.recorder.start():
+                raise RuntimeError("Failed to start video recorder")
+            
+            # Start recording based on mode
+            if cfg.gps_enabled and cfg.speed_recording_enabled:
+                self.logger.info(
+                    f"Speed-based recording enabled. Waiting for speed >= "
+                    f"{cfg.start_recording_speed_mph} mph"
+                )
+                # Ensure indicator is off until we actually begin recording
+                self.recorder.stop_recording()
+            else:
+                self.logger.info("Starting recording...")
+                self.recorder.start_recording()
+            
+            self.running = True
+            self.logger.info("Dashcam system started successfully")
+            self.logger.info("=" * 60)
+            
+            # Status logging runs on its own thread so stats collection
+            # never holds up the main loop
+            self._status_thread = threading.Thread(target=self._status_worker, daemon=True)
+            self._status_thread.start()
+            
+            # Main loop
+            self._main_loop()
+            
+        except Exception as e:
+            self.logger.error(f"Failed to start dashcam system: {e}", exc_info=True)
+            self.stop()
+            return False
+    
+    def stop(self):
+        """Stop dashcam system"""
+        if not self.running:
+            return
+        
+        self.logger.info("=" * 60)
+        self.logger.info("Shutting down dashcam system...")
+        self.running = False
+        self._wake.set()
+        
+        if self._status_thread and self._status_thread is not threading.current_thread():
+            self._status_thread.join(timeout=1.0)
+        self._status_thread = None
+        
+        # Stop components in reverse order
+        if self.recorder:
+            self.logger.info("Stopping video recorder...")
+            try:
+                self.recorder.stop()
+            except Exception as e:
+                self.logger.error(f"Error stopping recorder: {e}")
+        
+        if self.gps:
+            self.logger.info("Stopping GPS...")
+            try:
+                self.gps.stop()
+            except Exception as e:
+                self.logger.error(f"Error stopping GPS: {e}")
+
+        if self.canbus:
+            self.logger.info("Stopping CAN bus...")
+            try:
+                self.canbus.stop()
+            except Exception as e:
+                self.logger.error(f"Error stopping CAN bus: {e}")
+            self.canbus = None
+        
+        if self.display:
+            self.logger.info("Stopping display...")
+            try:
+                self.display.stop()
+            except Exception as e:
+                self.logger.error(f"Error stopping display: {e}")
+        
+        self.logger.info("Dashcam system stopped")
+        self.logger.info("=" * 60)
+    
+    def _stop_log_listener(self):
+        """Flush queued log records, stop the logging thread and detach its queue"""
+        listener, self._log_listener = self._log_listener, None
+        if listener:
+            self.logger.removeHandler(self._log_queue_handler)
+            listener.stop()
+    
+    def _main_loop(self):
+        """Main monitoring loop"""
+        tick_interval = 1.0
+        cfg = self.config
+        gps_enabled = cfg.gps_enabled
+        display_speed = cfg.display_speed
+        retry_delay = cfg.gps_retry_delay
+        next_tick = time.monotonic() + tick_interval
+        
+        try:
+            while self.running:
+                # Sleep until the next tick; stop()/signals set _wake to return early
+                self._wake.wait(timeout=max(0.0, next_tick - time.monotonic()))
+                if not self.running:
+                    break
+                now = time.monotonic()
+                # Fixed cadence without drift; skip ticks we slept through
+                next_tick += tick_interval
+                if next_tick <= now:
+                    next_tick = now + tick_interval
+                
+                # Retry GPS startup if it failed or stopped
+                if (
+                    gps_enabled and 
+                    (self.gps is None or not getattr(self.gps, 'running', False))
+                ):
+                    if now >= self.next_gps_retry:
+                        self.logger.info("Attempting to (re)start GPS...")
+                        self.gps = GPSHandler(cfg)
+                        if self.gps.start():
+                            self.logger.info("GPS (re)started successfully")
+                            self.next_gps_retry = 0.0
+                        else:
+                            self.logger.warning(
+                                f"GPS start retry failed; will retry in {retry_delay}s"
+                            )
+                            self.gps = None
+                            self.next_gps_retry = time.monotonic() + retry_delay
+                
+                # Update GPS data to display if available
+                if display_speed and self.gps and self.display:
+                    try:
+                        # Only push when the speed (or fix state) changed
+                        speed = self.gps.get_speed_mph()
+                        if speed != self._last_pushed_speed:
+                            self.display.update_gps_data(speed)
+                            self._last_pushed_speed = speed
+                    except Exception as e:
+                        self.logger.debug(f"Error updating GPS display: {e}")
+
+                # Manage speed-based recording
+                self._manage_speed_based_recording()
+                
+        except KeyboardInterrupt:
+            self.logger.info("Received keyboard interrupt")
+        except Exception as e:
+            self.logger.error(f"Main loop error: {e}", exc_info=True)
+        finally:
+            self.stop()
+    
+    def _status_worker(self):
+        """Periodic status logging (runs until stop() sets _wake)"""
+        while not self._wake.wait(self.status_interval):
+            self._log_status()
+    
+    def _signal_handler(self, signum, frame):
+        """Handle system signals"""
+        self.logger.info(f"Received signal {signum}")
+        self.running = False
+        self._wake.set()
+
+    def _manage_speed_based_recording(self):
+        """Start/stop recording based on current GPS speed"""
+        if not self.recorder or not (self.config.gps_enabled and self.config.speed_recording_enabled):
+            return
+
+        # Require an active GPS session to evaluate speed
+        if not self.gps or not getattr(self.gps, 'running', False):
+            return
+
+        now = time.monotonic()
+        should_record = self.gps.should_record()
+
+        if should_record:
+            self.last_movement_time = now
+            if not self.recorder.is_recording():
+                self.logger.info(
+                    f"Speed {self.gps.speed_mph:.1f} mph reached - starting recording"
+                )
+                self.recorder.start_recording()
+        else:
+            # Only stop if we've been below threshold long enough
+            if self.last_movement_time and self.recorder.is_recording():
+                if now - self.last_movement_time >= self.config.stop_recording_delay_seconds:
+                    self.logger.info(
+                        f"Below speed threshold for {self.config.stop_recording_delay_seconds}s - stopping recording"
+                    )
+                    self.recorder.stop_recording()
+    
+    def _log_configuration(self):
+        """Log current configuration"""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        
+        cfg = self.config
+        log = self.logger.info
+        log("Configuration:")
+        log("  Display: %sx%s @ %sfps", cfg.display_width, cfg.display_height, cfg.display_fps)
+        log("  Mirror Mode: %s", cfg.display_mirror_mode)
+        
+        # Front camera config
+        if cfg.front_camera_enabled:
+            log(
+                "  Front Camera: %sx%s @ %sfps",
+                cfg.front_camera_width, cfg.front_camera_height, cfg.front_camera_fps
+            )
+            log("    Recording: %s", cfg.front_camera_recording_enabled)
+            if cfg.front_camera_recording_enabled:
+                log("    Bitrate: %.1fMbps", cfg.front_camera_bitrate_mbps)
+        
+        # Rear camera config
+        if cfg.rear_camera_enabled:
+            log(
+                "  Rear Camera: %sx%s @ %sfps",
+                cfg.rear_camera_width, cfg.rear_camera_height, cfg.rear_camera_fps
+            )
+            log("    Recording: %s", cfg.rear_camera_recording_enabled)
+            if cfg.rear_camera_recording_enabled:
+                log("    Bitrate: %.1fMbps", cfg.rear_camera_bitrate_mbps)
+        
+        log("  Video Codec: %s", cfg.video_codec)
+        log("  Segment Duration: %ss", cfg.video_segment_duration)
+        log("  Storage: %s", cfg.video_dir)
+        log("  Minimum Free Space: %sGB", cfg.keep_minimum_gb)
+        log("  Logs: %s", cfg.log_dir)
+        log("  GPS: %s", 'Enabled' if cfg.gps_enabled else 'Disabled')
+        log("  CAN Bus: %s", 'Enabled' if cfg.canbus_enabled else 'Disabled')
+        if cfg.canbus_enabled:
+            log("    Vehicle: %s", cfg.canbus_vehicle_type)
+            log("    Channel: %s @ %sbps", cfg.canbus_channel, cfg.canbus_bitrate)
+            log("    Display CAN Data: %s", cfg.display_canbus_data)
+        
+        if cfg.gps_enabled and cfg.speed_recording_enabled:
+            log("  Speed Recording: Start at %s mph", cfg.start_recording_speed_mph)
+        elif cfg.front_camera_recording_enabled or cfg.rear_camera_recording_enabled:
+            log("  Recording Mode: Continuous")
+    
+    def _log_status(self):
+        """Log current system status"""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        
+        try:
+            # Recorder stats
+            if self.recorder:
+                rec_stats = self.recorder.get_stats()
+                status_parts = []
+                
+                if 'front_camera_ready' in rec_stats:
+                    status_parts.append(f"Front={'ON' if rec_stats['front_camera_ready'] else 'OFF'}")
+                    if rec_stats.get('front_recording'):
+                        status_parts.append("F_REC=✓")
+                
+                if 'rear_camera_ready' in rec_stats:
+                    status_parts.append(f"Rear={'ON' if rec_stats['rear_camera_ready'] else 'OFF'}")
+                    if rec_stats.get('rear_recording'):
+                        status_parts.append("R_REC=✓")
+                
+                if 'rear_frames' in rec_stats:
+                    status_parts.append(f"Frames={rec_stats['rear_frames']}")
+                
+                if status_parts:
+                    self.logger.info("Status: %s", ', '.join(status_parts))
+            
+            # Display stats (debug only; skip collecting them otherwise)
+            if self.display and self.logger.isEnabledFor(logging.DEBUG):
+                disp_stats = self.display.get_stats()
+                self.logger.debug(
+                    "Display: %s frames, FPS: %.1f/%s",
+                    disp_stats['frame_count'],
+                    disp_stats['actual_fps'],
+                    disp_stats['target_fps'],
+                )
+            
+            # GPS stats
+            if self.gps:
+                try:
+                    gps_stats = self.gps.get_status()
+                    if gps_stats['has_fix']:
+                        self.logger.info(
+                            "GPS: %.1f mph, Position: %.6f, %.6f",
+                            gps_stats['speed_mph'],
+                            gps_stats['latitude'],
+                            gps_stats['longitude'],
+                        )
+                    else:
+                        self.logger.debug("GPS: No fix")
+                except Exception as e:
+                    self.logger.debug("GPS status error: %s", e)
+
+            # CAN bus stats
+            if self.canbus:
+                try:
+                    can_stats = self.canbus.get_stats()
+                    connected = can_stats.get("connected", False)
+                    msg_rx = can_stats.get("messages_received", 0)
+                    self.logger.info("CAN: %s RX=%s", 'OK' if connected else 'WAIT', msg_rx)
+                except Exception as e:
+                    self.logger.debug("CAN status error: %s", e)
+            
+        except Exception as e:
+            self.logger.error(f"Failed to log status: {e}")
+
+
+def main():
+    """Main entry point"""
+    print("=" * 60)
+    print("Active Dash Mirror")
+    print("Raspberry Pi 5 Dashcam System")
+    print("Dual CSI Camera Setup")
+    print("=" * 60)
+    print()
+    
+    # Check if running as root (needed for framebuffer access)
+    if os.geteuid() != 0:
+        print("WARNING: Not running as root. Framebuffer access may fail.")
+        print("Consider running with: sudo python3 dashcam.py")
+        print()
+    
+    # Create system
+    system = DashcamSystem()
+    
+    # Setup signal handlers for graceful shutdown
+    def handle_signal(signum, frame):
+        """Handle termination signals"""
+        try:
+            if system:
+                system.stop()
+        finally:
+            sys.exit(0)
+    
+    signal.signal(signal.SIGTERM, handle_signal)
+    signal.signal(signal.SIGINT, handle_signal)
+    
+    # Start the system
+    try:
+        system.start()
+    except KeyboardInterrupt:
+        print("\nShutdown requested...")
+        system.stop()
+    except Exception as e:
+        print(f"Fatal error: {e}")
+        import traceback
+        traceback.print_exc()
+        system.stop()
+        sys.exit(1)
+    
+    print()
+    print("=" * 60)
+    print("Active Dash Mirror - Stopped")
+    print("=" * 60)
+    sys.exit(0)
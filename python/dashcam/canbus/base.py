@@ -6,22 +6,34 @@ Provides base interface for vehicle CAN communication
 
 import can
 import logging
+import os
+import selectors
 import time
+from collections import defaultdict
 from threading import Thread, Event, Lock
 from typing import Optional, Callable, Dict, List
 from dataclasses import dataclass
 from enum import Enum
 
 
+# Number of standard (11-bit) CAN identifiers
+STANDARD_ID_COUNT = 0x800
+
+
 class CANChannel(Enum):
     """CAN channels on the hat"""
     CAN0 = "can0"
     CAN1 = "can1"
 
 
-@dataclass
+@dataclass(slots=True)
 class CANMessage:
-    """Represents a CAN message"""
+    """
+    Represents a CAN message
+    
+    For received frames, data is the python-can frame buffer (usually a
+    bytearray) shared by all handlers of that frame; treat it as read-only.
+    """
     arbitration_id: int
     data: bytes
     timestamp: float
@@ -29,14 +41,23 @@ class CANMessage:
     is_extended_id: bool = False
     
     def __str__(self):
-        data_hex = ' '.join(f'{b:02X}' for b in self.data)
+        data_hex = self.data.hex(' ').upper()
         return f"ID: 0x{self.arbitration_id:03X} [{len(self.data)}] {data_hex}"
 
 
 class CANBusInterface:
     """Base CAN bus interface for Waveshare 2-CH CAN HAT Plus"""
     
-    def __init__(self, config, channel: CANChannel = CANChannel.CAN0, bitrate: int = 500000):
+    # Longest the receive thread blocks waiting for a frame before running
+    # housekeeping (no-traffic/stats logging, stop checks)
+    RECV_WAIT_TIMEOUT = 1.0
+    # Max frames drained per wakeup before housekeeping gets a turn
+    RECV_BATCH_MAX = 256
+    # Upper bound for the back-off applied after receive errors
+    RECV_ERROR_BACKOFF_MAX = 1.0
+    
+    def __init__(self, config, channel: CANChannel = CANChannel.CAN0, bitrate: int = 500000,
+                 auto_filter: bool = True):
         """
         Initialize CAN bus interface
         
@@ -44,10 +65,13 @@ class CANBusInterface:
             config: System configuration
             channel: CAN channel to use (CAN0 or CAN1)
             bitrate: CAN bus bitrate (default 500000 for most vehicles)
+            auto_filter: Keep SocketCAN kernel filters in sync with the
+                         registered handler IDs (False to receive all frames)
         """
         self.config = config
         self.channel = channel.value
         self.bitrate = bitrate
+        self.auto_filter = auto_filter
         self.logger = logging.getLogger(f"CANBus-{channel.value}")
         
         # CAN bus
@@ -56,6 +80,11 @@ class CANBusInterface:
         
         # Message handling
         self.message_handlers: Dict[int, List[Callable]] = {}  # ID -> [callbacks]
+        # Flat view of message_handlers for 11-bit IDs so dispatch is a
+        # list index instead of a dict lookup (slots share the dict's lists)
+        self._std_handlers: List[Optional[List[Callable]]] = [None] * STANDARD_ID_COUNT
+        self.raw_handlers: Dict[int, List[Callable]] = {}  # ID -> [can.Message callbacks]
+        self._std_raw_handlers: List[Optional[List[Callable]]] = [None] * STANDARD_ID_COUNT
         self.raw_message_callback: Optional[Callable] = None
         
         # Statistics
@@ -78,6 +107,7 @@ class CANBusInterface:
         # Threading
         self.running = False
         self.stop_event = Event()
+        self._stop_fd: Optional[int] = None  # eventfd that wakes the receive thread's select
         self.receive_thread = None
         self.stats_lock = Lock()
         
@@ -95,6 +125,9 @@ class CANBusInterface:
             
             self.connected = True
             
+            # Handlers may have been registered before the bus existed
+            self._refresh_auto_filters()
+            
             # Start receive thread
             self.running = True
             self.stop_event.clear()
@@ -103,6 +136,7 @@ class CANBusInterface:
             self.last_stats_log_time = self.start_time
             self.last_no_traffic_log = 0.0
             self.first_message_logged = False
+            self._stop_fd = os.eventfd(0) if hasattr(os, "eventfd") else None
             self.receive_thread = Thread(target=self._receive_loop, daemon=True)
             self.receive_thread.start()
             
@@ -119,10 +153,16 @@ class CANBusInterface:
         self.logger.info("Stopping CAN bus...")
         self.running = False
         self.stop_event.set()
+        if self._stop_fd is not None:
+            os.eventfd_write(self._stop_fd, 1)
         
         if self.receive_thread:
             self.receive_thread.join(timeout=2.0)
         
+        if self._stop_fd is not None:
+            os.close(self._stop_fd)
+            self._stop_fd = None
+        
         if self.bus:
             try:
                 self.bus.shutdown()
@@ -166,7 +206,8 @@ class CANBusInterface:
             with self.stats_lock:
                 self.messages_sent += 1
             
-            self.logger.debug(f"TX: {self._format_message(msg)}")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("TX: %s", self._format_message(msg))
             return True
             
         except Exception as e:
@@ -185,9 +226,12 @@ class CANBusInterface:
         """
         if arbitration_id not in self.message_handlers:
             self.message_handlers[arbitration_id] = []
+            if 0 <= arbitration_id < STANDARD_ID_COUNT:
+                self._std_handlers[arbitration_id] = self.message_handlers[arbitration_id]
         
         self.message_handlers[arbitration_id].append(callback)
         self.logger.debug(f"Registered handler for ID 0x{arbitration_id:03X}")
+        self._refresh_auto_filters()
     
     def unregister_handler(self, arbitration_id: int, callback: Callable):
         """Unregister a callback for specific CAN ID"""
@@ -196,7 +240,47 @@ class CANBusInterface:
                 self.message_handlers[arbitration_id].remove(callback)
                 if not self.message_handlers[arbitration_id]:
                     del self.message_handlers[arbitration_id]
+                    if 0 <= arbitration_id < STANDARD_ID_COUNT:
+                        self._std_handlers[arbitration_id] = None
                 self.logger.debug(f"Unregistered handler for ID 0x{arbitration_id:03X}")
+                self._refresh_auto_filters()
+            except ValueError:
+                pass
+    
+    def register_raw_handler(self, arbitration_id: int, callback: Callable[[can.Message], None]):
+        """
+        Register a callback that receives the python-can frame directly
+        
+        Skips building a CANMessage for consumers that only need
+        arbitration_id/data. python-can allocates a fresh frame and data
+        buffer for every recv(), so handlers may keep the frame past the
+        callback, but must treat it as read-only: the same object is
+        passed to every handler and to the CANMessage dispatch.
+        
+        Args:
+            arbitration_id: CAN message ID to listen for
+            callback: Function to call with the can.Message when received
+        """
+        if arbitration_id not in self.raw_handlers:
+            self.raw_handlers[arbitration_id] = []
+            if 0 <= arbitration_id < STANDARD_ID_COUNT:
+                self._std_raw_handlers[arbitration_id] = self.raw_handlers[arbitration_id]
+        
+        self.raw_handlers[arbitration_id].append(callback)
+        self.logger.debug(f"Registered raw handler for ID 0x{arbitration_id:03X}")
+        self._refresh_auto_filters()
+    
+    def unregister_raw_handler(self, arbitration_id: int, callback: Callable):
+        """Unregister a raw frame callback for specific CAN ID"""
+        if arbitration_id in self.raw_handlers:
+            try:
+                self.raw_handlers[arbitration_id].remove(callback)
+                if not self.raw_handlers[arbitration_id]:
+                    del self.raw_handlers[arbitration_id]
+                    if 0 <= arbitration_id < STANDARD_ID_COUNT:
+                        self._std_raw_handlers[arbitration_id] = None
+                self.logger.debug(f"Unregistered raw handler for ID 0x{arbitration_id:03X}")
+                self._refresh_auto_filters()
             except ValueError:
                 pass
     
@@ -204,81 +288,245 @@ class CANBusInterface:
         """
         Set callback for all CAN messages (for logging/debugging)
         
+        While a callback is set, automatic kernel filtering is lifted so
+        the callback sees every frame on the bus.
+        
         Args:
             callback: Function to call for every received message
         """
         self.raw_message_callback = callback
+        self._refresh_auto_filters()
+    
+    def _refresh_auto_filters(self):
+        """Push kernel filters matching the IDs that have handlers registered"""
+        if not self.auto_filter or not self.bus:
+            return
+        
+        if self.raw_message_callback is not None:
+            filters = None  # Monitor mode wants every frame
+        else:
+            filters = []
+            for can_id in sorted(self.message_handlers.keys() | self.raw_handlers.keys()):
+                if can_id < STANDARD_ID_COUNT:
+                    filters.append({"can_id": can_id, "can_mask": 0x7FF, "extended": False})
+                else:
+                    filters.append({"can_id": can_id, "can_mask": 0x1FFFFFFF, "extended": True})
+        
+        try:
+            # An empty list (no handlers yet) means receive everything
+            self.bus.set_filters(filters or None)
+            self.logger.debug(
+                f"Auto filters: {len(filters) if filters else 'all'} CAN IDs"
+            )
+        except Exception as e:
+            self.logger.error(f"Failed to update CAN filters: {e}")
+    
+    def _open_selector(self) -> Optional[selectors.BaseSelector]:
+        """
+        Create a selector on the CAN socket so the receive thread can sleep
+        in the kernel until a frame arrives. The stop eventfd is registered
+        too, so stop() wakes the thread immediately.
+        
+        Returns None if the bus does not expose a file descriptor, in which
+        case the receive loop falls back to blocking recv() calls.
+        """
+        try:
+            fileno = self.bus.fileno()
+        except (AttributeError, NotImplementedError):
+            return None
+        if fileno is None or fileno < 0:
+            return None
+        
+        selector = selectors.DefaultSelector()
+        selector.register(fileno, selectors.EVENT_READ)
+        if self._stop_fd is not None:
+            selector.register(self._stop_fd, selectors.EVENT_READ)
+        return selector
     
     def _receive_loop(self):
         """Main receive loop for CAN messages"""
         self.logger.info("CAN receive thread started")
         
-        while self.running and not self.stop_event.is_set():
-            now = time.time()
-            self._maybe_log_no_traffic(now)
-            self._maybe_log_stats(now)
-            try:
-                # Receive message with timeout
-                msg = self.bus.recv(timeout=0.1)
-                
-                if msg is None:
-                    continue
-                
-                # Update stats
+        selector = self._open_selector()
+        notifier = None
+        if selector is not None:
+            recv = self.bus.recv
+        else:
+            # No pollable fd: let python-can's Notifier thread read the bus
+            # into a buffer and drain that instead
+            self.logger.debug("CAN bus has no fileno; using can.Notifier")
+            reader = can.BufferedReader()
+            notifier = can.Notifier(self.bus, [reader], timeout=self.RECV_WAIT_TIMEOUT)
+            recv = reader.get_message
+        error_backoff = 0.0
+        
+        try:
+            while self.running and not self.stop_event.is_set():
+                now = time.time()
+                self._maybe_log_no_traffic(now)
+                self._maybe_log_stats(now)
+                try:
+                    # Block until the socket is readable (or the housekeeping
+                    # timeout expires) instead of polling every 100 ms
+                    if selector is not None:
+                        ready = selector.select(timeout=self.RECV_WAIT_TIMEOUT)
+                        if not ready or self.stop_event.is_set():
+                            continue
+                        received = self._drain_messages(recv, timeout=0,
+                                                        frame_clock=True)
+                    else:
+                        received = self._drain_messages(recv, timeout=self.RECV_WAIT_TIMEOUT)
+                    
+                    if received:
+                        error_backoff = 0.0
+                    
+                except Exception as e:
+                    if self.running:  # Only log if we're supposed to be running
+                        self.logger.error(f"Error receiving CAN message: {e}")
+                        with self.stats_lock:
+                            self.errors += 1
+                    # Exponential back-off so a persistent fault doesn't spin
+                    error_backoff = min(
+                        max(error_backoff * 2, 0.05), self.RECV_ERROR_BACKOFF_MAX
+                    )
+                    self.stop_event.wait(error_backoff)
+        finally:
+            if selector is not None:
+                selector.close()
+            if notifier is not None:
+                notifier.stop()
+        
+        self.logger.info("CAN receive thread stopped")
+    
+    def _drain_messages(self, recv: Callable[..., Optional[can.Message]],
+                        timeout: float, frame_clock: bool = False) -> int:
+        """
+        Dispatch every frame currently queued on the bus
+        
+        Only the first recv() waits (up to timeout); the rest are non-blocking
+        so one wakeup services a whole burst. Stats are updated once per batch
+        with at most one clock read, and the debug level is checked once per
+        batch.
+        
+        Args:
+            recv: bus.recv or BufferedReader.get_message
+            timeout: How long the first read may block
+            frame_clock: Frame timestamps are epoch wall-clock time (SocketCAN)
+                and may stand in for time.time()
+        
+        Returns:
+            Number of frames dispatched
+        """
+        dispatch = self._dispatch_message
+        handlers = self.message_handlers
+        std_handlers = self._std_handlers
+        raw_handlers = self.raw_handlers
+        std_raw_handlers = self._std_raw_handlers
+        raw_callback = self.raw_message_callback
+        debug_enabled = self.logger.isEnabledFor(logging.DEBUG)
+        batch_max = self.RECV_BATCH_MAX
+        received = 0
+        last_timestamp = 0.0
+        
+        try:
+            msg = recv(timeout=timeout)
+            while msg is not None:
+                received += 1
+                last_timestamp = msg.timestamp
+                dispatch(msg, std_handlers, handlers, std_raw_handlers,
+                         raw_handlers, raw_callback, debug_enabled)
+                if received >= batch_max:
+                    break
+                msg = recv(timeout=0)
+        finally:
+            if received:
                 with self.stats_lock:
-                    self.messages_received += 1
+                    self.messages_received += received
+                # SocketCAN stamps frames with kernel wall-clock time, so the
+                # newest frame's timestamp stands in for time.time(). Other
+                # interfaces may use a different clock base, so read the wall
+                # clock once instead. A plain attribute store is atomic, no
+                # lock needed.
+                if frame_clock and last_timestamp:
+                    self.last_message_time = last_timestamp
+                else:
                     self.last_message_time = time.time()
-                
-                if not self.first_message_logged:
-                    self.logger.info(
-                        f"First CAN message received on {self.channel} "
-                        f"(ID 0x{msg.arbitration_id:03X})"
+        
+        return received
+    
+    def _dispatch_message(self, msg: can.Message,
+                          std_handlers: List[Optional[List[Callable]]],
+                          handlers: Dict[int, List[Callable]],
+                          std_raw_handlers: List[Optional[List[Callable]]],
+                          raw_handlers: Dict[int, List[Callable]],
+                          raw_callback: Optional[Callable],
+                          debug_enabled: bool):
+        """Hand a received frame to the raw callback and registered handlers"""
+        arbitration_id = msg.arbitration_id
+        
+        if not self.first_message_logged:
+            self.logger.info(
+                f"First CAN message received on {self.channel} "
+                f"(ID 0x{arbitration_id:03X})"
+            )
+            self.first_message_logged = True
+            self.last_no_traffic_log = time.time()
+        
+        # Raw handlers get the python-can frame as-is
+        if arbitration_id < STANDARD_ID_COUNT:
+            frame_handlers = std_raw_handlers[arbitration_id]
+        else:
+            frame_handlers = raw_handlers.get(arbitration_id)
+        if frame_handlers:
+            for handler in frame_handlers:
+                try:
+                    handler(msg)
+                except Exception as e:
+                    self.logger.error(
+                        f"Error in raw handler for ID 0x{arbitration_id:03X}: {e}"
                     )
-                    self.first_message_logged = True
-                    self.last_no_traffic_log = time.time()
-                
-                # Convert to our message format
-                can_msg = CANMessage(
-                    arbitration_id=msg.arbitration_id,
-                    data=bytes(msg.data),
-                    timestamp=msg.timestamp,
-                    channel=self.channel,
-                    is_extended_id=msg.is_extended_id
-                )
-                
-                # Log if debug enabled
-                if self.logger.isEnabledFor(logging.DEBUG):
-                    self.logger.debug(f"RX: {can_msg}")
-                
-                # Call raw message callback if set
-                if self.raw_message_callback:
-                    try:
-                        self.raw_message_callback(can_msg)
-                    except Exception as e:
-                        self.logger.error(f"Error in raw message callback: {e}")
-                
-                # Call registered handlers
-                if msg.arbitration_id in self.message_handlers:
-                    for handler in self.message_handlers[msg.arbitration_id]:
-                        try:
-                            handler(can_msg)
-                        except Exception as e:
-                            self.logger.error(
-                                f"Error in handler for ID 0x{msg.arbitration_id:03X}: {e}"
-                            )
-                
+        
+        if arbitration_id < STANDARD_ID_COUNT:
+            id_handlers = std_handlers[arbitration_id]
+        else:
+            id_handlers = handlers.get(arbitration_id)
+        if not (id_handlers or raw_callback or debug_enabled):
+            return
+        
+        # Convert to our message format. python-can allocates a fresh data
+        # buffer for every received frame, so it is shared rather than copied
+        can_msg = CANMessage(
+            arbitration_id=arbitration_id,
+            data=msg.data,
+            timestamp=msg.timestamp,
+            channel=self.channel,
+            is_extended_id=msg.is_extended_id
+        )
+        
+        # Log if debug enabled
+        if debug_enabled:
+            self.logger.debug("RX: %s", can_msg)
+        
+        # Call raw message callback if set
+        if raw_callback:
+            try:
+                raw_callback(can_msg)
             except Exception as e:
-                if self.running:  # Only log if we're supposed to be running
-                    self.logger.error(f"Error receiving CAN message: {e}")
-                    with self.stats_lock:
-                        self.errors += 1
-                time.sleep(0.1)
+                self.logger.error(f"Error in raw message callback: {e}")
         
-        self.logger.info("CAN receive thread stopped")
+        # Call registered handlers
+        if id_handlers:
+            for handler in id_handlers:
+                try:
+                    handler(can_msg)
+                except Exception as e:
+                    self.logger.error(
+                        f"Error in handler for ID 0x{arbitration_id:03X}: {e}"
+                    )
     
     def _format_message(self, msg: can.Message) -> str:
         """Format a CAN message for logging"""
-        data_hex = ' '.join(f'{b:02X}' for b in msg.data)
+        data_hex = msg.data.hex(' ').upper()
         return f"ID: 0x{msg.arbitration_id:03X} [{msg.dlc}] {data_hex}"
     
     def get_stats(self) -> dict:
@@ -292,7 +540,7 @@ class CANBusInterface:
                 'messages_sent': self.messages_sent,
                 'errors': self.errors,
                 'last_message_time': self.last_message_time,
-                'handlers_registered': len(self.message_handlers)
+                'handlers_registered': len(self.message_handlers.keys() | self.raw_handlers.keys())
             }
     
     def _maybe_log_no_traffic(self, now: float):
@@ -372,7 +620,7 @@ class CANBusMonitor:
     def __init__(self, canbus: CANBusInterface):
         self.canbus = canbus
         self.logger = logging.getLogger("CANMonitor")
-        self.message_counts: Dict[int, int] = {}
+        self.message_counts: Dict[int, int] = defaultdict(int)
         self.monitoring = False
         
     def start_monitoring(self):
@@ -389,13 +637,13 @@ class CANBusMonitor:
     
     def _on_message(self, msg: CANMessage):
         """Called for every CAN message"""
-        if msg.arbitration_id not in self.message_counts:
-            self.message_counts[msg.arbitration_id] = 0
         self.message_counts[msg.arbitration_id] += 1
     
     def get_message_counts(self) -> Dict[int, int]:
         """Get count of messages by ID"""
-        return self.message_counts.copy()
+        # dict() copies in a single C call, so the receive thread can keep
+        # counting without a lock
+        return dict(self.message_counts)
     
     def print_summary(self):
         """Print summary of CAN traffic"""
@@ -403,7 +651,7 @@ class CANBusMonitor:
         print("CAN Bus Traffic Summary")
         print("="*60)
         
-        sorted_ids = sorted(self.message_counts.items(), 
+        sorted_ids = sorted(self.get_message_counts().items(), 
                           key=lambda x: x[1], 
                           reverse=True)
         
@@ -9,25 +9,90 @@ CAN Bus Details:
 """
 
 import logging
+import struct
 import time
-from typing import Optional, Dict, Any
-from dataclasses import dataclass
-from canbus import CANBusInterface, CANChannel, CANMessage
+from collections import deque
+from threading import Thread, Event
+from typing import Optional, Dict, Any, Callable
+from dataclasses import dataclass, field
+import can
+from canbus import CANBusInterface, CANChannel
 
 
-@dataclass
+# Unit conversion factors
+KPH_TO_MPH = 0.621371
+KPA_TO_PSI = 0.145038
+LITERS_PER_GALLON = 3.78541
+NS_TO_HOURS = 1.0 / 3.6e12
+
+# Keys of CamaroVehicleData.to_dict(), in the order the values are built
+_VEHICLE_DATA_KEYS = (
+    'rpm',
+    'coolant_temp_c',
+    'coolant_temp_f',
+    'oil_pressure_kpa',
+    'oil_pressure_psi',
+    'throttle_position',
+    'manifold_pressure',
+    'intake_air_temp_c',
+    'intake_air_temp_f',
+    'vehicle_speed_kph',
+    'vehicle_speed_mph',
+    'transmission_gear',
+    'fuel_level_percent',
+    'fuel_flow_rate',
+    'fuel_consumed_liters',
+    'fuel_consumed_gallons',
+    'battery_voltage',
+    'mil_status',
+    'dtc_count',
+    'last_update',
+)
+
+# Prebuilt big-endian layouts for the multi-byte fields
+_RPM_SPEED = struct.Struct('>HH')     # 0x0C9 bytes 0-3
+_FUEL_FLOW = struct.Struct('>xH')     # 0x3D1 bytes 1-2
+_BCM_VOLTAGE = struct.Struct('>4xH')  # 0x4C1 bytes 4-5
+
+# Fuel auto-reset states
+FUEL_IDLE = 0       # Not yet seen below threshold since start/last auto-reset
+FUEL_BELOW = 1      # Has been below threshold (driven), waiting for a refill
+FUEL_PENDING = 2    # Back above threshold, reset timer running
+
+# Fuel auto-reset actions
+_FUEL_NONE = 0
+_FUEL_START_TIMER = 1
+_FUEL_CANCEL_TIMER = 2
+_FUEL_CHECK_TIMER = 3
+
+# state -> (transition when below threshold, transition when at/above it)
+_FUEL_TRANSITIONS = (
+    ((FUEL_BELOW, _FUEL_NONE), (FUEL_IDLE, _FUEL_NONE)),                # FUEL_IDLE
+    ((FUEL_BELOW, _FUEL_NONE), (FUEL_PENDING, _FUEL_START_TIMER)),      # FUEL_BELOW
+    ((FUEL_BELOW, _FUEL_CANCEL_TIMER), (FUEL_PENDING, _FUEL_CHECK_TIMER)),  # FUEL_PENDING
+)
+
+# Temperatures arrive as one byte (Celsius = value - 40), so every possible
+# Fahrenheit reading is precomputed and indexed by the raw byte
+_RAW_TEMP_TO_F = tuple((raw - 40) * 9 / 5 + 32 for raw in range(256))
+
+
+@dataclass(slots=True)
 class CamaroVehicleData:
     """Container for Camaro vehicle data from CAN bus"""
     # Engine data
     rpm: Optional[int] = None
     coolant_temp: Optional[float] = None  # Celsius
+    coolant_temp_f: Optional[float] = None  # Fahrenheit
     oil_pressure: Optional[float] = None  # kPa
     throttle_position: Optional[float] = None  # Percent
     manifold_pressure: Optional[float] = None  # kPa
     intake_air_temp: Optional[float] = None  # Celsius
+    intake_air_temp_f: Optional[float] = None  # Fahrenheit
     
     # Speed and transmission
     vehicle_speed: Optional[float] = None  # km/h
+    vehicle_speed_mph: Optional[float] = None  # MPH
     transmission_gear: Optional[int] = None
     
     # Fuel system
@@ -36,7 +101,7 @@ class CamaroVehicleData:
     
     # Fuel consumption tracking
     fuel_consumed_liters: float = 0.0  # Total fuel consumed since reset (liters)
-    last_fuel_update_time: Optional[float] = None  # Timestamp of last fuel flow update
+    last_fuel_update_ns: Optional[int] = None  # Monotonic time of last fuel flow update (ns)
     
     # Battery/electrical
     battery_voltage: Optional[float] = None  # Volts
@@ -48,30 +113,68 @@ class CamaroVehicleData:
     # Timestamps
     last_update: float = 0.0
     
+    # Cached to_dict() result; cleared whenever a decoder updates the data
+    _dict_cache: Optional[Dict[str, Any]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # Bumped on every update, so to_dict() can tell whether a parser pass
+    # ran while it was reading fields
+    _generation: int = field(default=0, init=False, repr=False, compare=False)
+    
+    def mark_updated(self, timestamp: float):
+        """Record a decoder update and drop the cached dictionary"""
+        self.last_update = timestamp
+        self._generation += 1
+        self._dict_cache = None
+    
+    def invalidate(self):
+        """Drop the cached dictionary after fields were changed directly"""
+        self._generation += 1
+        self._dict_cache = None
+    
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary"""
-        return {
-            'rpm': self.rpm,
-            'coolant_temp_c': self.coolant_temp,
-            'coolant_temp_f': self.coolant_temp * 9/5 + 32 if self.coolant_temp else None,
-            'oil_pressure_kpa': self.oil_pressure,
-            'oil_pressure_psi': self.oil_pressure * 0.145038 if self.oil_pressure else None,
-            'throttle_position': self.throttle_position,
-            'manifold_pressure': self.manifold_pressure,
-            'intake_air_temp_c': self.intake_air_temp,
-            'intake_air_temp_f': self.intake_air_temp * 9/5 + 32 if self.intake_air_temp else None,
-            'vehicle_speed_kph': self.vehicle_speed,
-            'vehicle_speed_mph': self.vehicle_speed * 0.621371 if self.vehicle_speed else None,
-            'transmission_gear': self.transmission_gear,
-            'fuel_level_percent': self.fuel_level,
-            'fuel_flow_rate': self.fuel_flow_rate,
-            'fuel_consumed_liters': self.fuel_consumed_liters,
-            'fuel_consumed_gallons': self.fuel_consumed_liters / 3.78541 if self.fuel_consumed_liters else 0.0,
-            'battery_voltage': self.battery_voltage,
-            'mil_status': self.mil_status,
-            'dtc_count': self.dtc_count,
-            'last_update': self.last_update
-        }
+        """
+        Convert to dictionary
+        
+        The result is cached until the next update, so callers must not
+        modify it. Code that sets fields directly must call mark_updated()
+        or invalidate() afterwards. A dictionary built while an update was
+        in progress is returned but not cached.
+        """
+        cached = self._dict_cache
+        if cached is not None:
+            return cached
+        
+        generation = self._generation
+        oil_pressure = self.oil_pressure
+        cached = dict(zip(_VEHICLE_DATA_KEYS, (
+            self.rpm,
+            self.coolant_temp,
+            self.coolant_temp_f,
+            oil_pressure,
+            None if oil_pressure is None else oil_pressure * KPA_TO_PSI,
+            self.throttle_position,
+            self.manifold_pressure,
+            self.intake_air_temp,
+            self.intake_air_temp_f,
+            self.vehicle_speed,
+            self.vehicle_speed_mph,
+            self.transmission_gear,
+            self.fuel_level,
+            self.fuel_flow_rate,
+            self.fuel_consumed_liters,
+            self.fuel_consumed_liters / LITERS_PER_GALLON,
+            self.battery_voltage,
+            self.mil_status,
+            self.dtc_count,
+            self.last_update,
+        )))
+        # Store, then re-check: an update that landed at any point since
+        # building started (even between a check and the store) drops it
+        self._dict_cache = cached
+        if self._generation != generation:
+            self._dict_cache = None
+        return cached
 
 
 class CamaroCANBus:
@@ -98,6 +201,14 @@ class CamaroCANBus:
     MSG_FUEL_SYSTEM = 0x3D1
     MSG_BCM_DATA = 0x4C1
     
+    # Frames buffered between the receive and parser threads. Sized to
+    # ride out several seconds of full HS-CAN traffic for these IDs
+    RX_QUEUE_SIZE = 4096
+    # Minimum spacing of parser passes, so bursts coalesce per ID
+    PARSE_INTERVAL = 0.01
+    # Decode errors for one ID are logged at most once per interval
+    DECODE_ERROR_LOG_INTERVAL = 10.0
+    
     def __init__(self, config, channel: CANChannel = CANChannel.CAN0):
         """
         Initialize Camaro CAN bus interface
@@ -109,16 +220,55 @@ class CamaroCANBus:
         self.config = config
         self.logger = logging.getLogger("CamaroCANBus")
         
-        # CAN bus interface (500 kbps for GM HS-CAN)
-        self.canbus = CANBusInterface(config, channel=channel, bitrate=500000)
+        # CAN bus interface (500 kbps for GM HS-CAN); kernel filters follow
+        # the registered handler IDs unless disabled in config
         self.use_filters = getattr(config, "canbus_use_filters", True)
+        self.canbus = CANBusInterface(
+            config, channel=channel, bitrate=500000, auto_filter=self.use_filters
+        )
+        
+        # Fuel settings, resolved once instead of per fuel frame
+        self._fuel_flow_factor = getattr(config, 'fuel_flow_conversion_factor', 0.01)
+        self._fuel_auto_reset = bool(getattr(config, 'fuel_auto_reset_enabled', False))
+        self._fuel_threshold = getattr(config, 'fuel_auto_reset_threshold', 95.0)
+        self._fuel_duration = getattr(config, 'fuel_auto_reset_duration', 5.0)
+        self._fuel_duration_ns = int(self._fuel_duration * 1e9)
+        self._fuel_safety_margin = getattr(config, 'fuel_safety_margin', 1.025)
         
         # Vehicle data
         self.vehicle_data = CamaroVehicleData()
         
+        # Decoder table: CAN ID -> bound handler. Registration and the
+        # kernel filter set are both driven from this one table
+        self._decoders: Dict[int, Callable[[can.Message], None]] = {
+            self.MSG_ENGINE_RPM_SPEED: self._handle_engine_rpm_speed,
+            self.MSG_ENGINE_COOLANT: self._handle_coolant_temp,
+            self.MSG_ENGINE_DATA: self._handle_engine_data,
+            self.MSG_TRANSMISSION: self._handle_transmission,
+            self.MSG_FUEL_SYSTEM: self._handle_fuel_system,
+            self.MSG_BCM_DATA: self._handle_bcm_data,
+        }
+        
+        # Single-producer/single-consumer handoff: the receive thread only
+        # appends frames (deque.append is atomic), the parser thread drains
+        # them and decodes the newest frame of each ID, so a slow decoder
+        # never holds up reading the socket. Frames are queued as-is (and
+        # their data kept in _last_raw): register_raw_handler guarantees a
+        # freshly allocated, read-only frame per receive
+        self._rx_queue = deque(maxlen=self.RX_QUEUE_SIZE)
+        self._rx_ready = Event()
+        self._parse_stop = Event()
+        self._parse_thread: Optional[Thread] = None
+        
+        # Payload last decoded per CAN ID; repeats of it are not decoded again
+        self._last_raw: Dict[int, bytearray] = {}
+        
+        # Decode error rate limiting: CAN ID -> [last log time, suppressed]
+        self._decode_errors: Dict[int, list] = {}
+        
         # Fuel auto-reset tracking
-        self._fuel_reset_timer_start = None  # Track when fuel level went above threshold
-        self._fuel_was_below_threshold = False  # Track if we've been below threshold (driven)
+        self._fuel_state = FUEL_IDLE
+        self._fuel_reset_timer_start = 0  # When fuel level went back above threshold (ns)
         
         # State
         self.started = False
@@ -132,11 +282,15 @@ class CamaroCANBus:
             if not self.canbus.start():
                 return False
             
-            # Register message handlers
+            # Start the parser before frames start arriving
+            self._parse_stop.clear()
+            self._parse_thread = Thread(target=self._parse_loop, daemon=True)
+            self._parse_thread.start()
+            
+            # Register message handlers (also installs the kernel filters)
             self._register_handlers()
             
-            # Set up CAN filters for the messages we care about
-            self._setup_filters()
+            self._log_filter_mode()
             
             self.started = True
             self.logger.info("Camaro CAN bus interface started")
@@ -151,39 +305,137 @@ class CamaroCANBus:
         self.logger.info("Stopping Camaro CAN bus interface...")
         self.started = False
         self.canbus.stop()
+        
+        self._parse_stop.set()
+        self._rx_ready.set()
+        if self._parse_thread:
+            self._parse_thread.join(timeout=1.0)
+            self._parse_thread = None
+        self._decode_pending()
+        
         self.logger.info("Camaro CAN bus interface stopped")
     
     def _register_handlers(self):
-        """Register handlers for Camaro-specific CAN messages"""
-        self.canbus.register_handler(self.MSG_ENGINE_RPM_SPEED, self._handle_engine_rpm_speed)
-        self.canbus.register_handler(self.MSG_ENGINE_COOLANT, self._handle_coolant_temp)
-        self.canbus.register_handler(self.MSG_ENGINE_DATA, self._handle_engine_data)
-        self.canbus.register_handler(self.MSG_TRANSMISSION, self._handle_transmission)
-        self.canbus.register_handler(self.MSG_FUEL_SYSTEM, self._handle_fuel_system)
-        self.canbus.register_handler(self.MSG_BCM_DATA, self._handle_bcm_data)
+        """Register handlers for Camaro-specific CAN messages
+        
+        Frames are registered as raw handlers (no CANMessage is built) and
+        only queued for the parser thread.
+        """
+        register = self.canbus.register_raw_handler
+        for can_id in self._decoders:
+            register(can_id, self._queue_frame)
         
         self.logger.info("Registered message handlers for Camaro CAN IDs")
     
-    def _setup_filters(self):
-        """Set up CAN filters for Camaro messages"""
+    def _queue_frame(self, msg: can.Message):
+        """Receive-thread callback: hand the frame to the parser thread"""
+        self._rx_queue.append(msg)
+        if not self._rx_ready.is_set():
+            self._rx_ready.set()
+    
+    def _parse_loop(self):
+        """Parser thread: decode queued frames as they arrive"""
+        rx_ready = self._rx_ready
+        stop = self._parse_stop
+        while True:
+            rx_ready.wait()
+            if stop.is_set():
+                break
+            rx_ready.clear()
+            self._decode_pending()
+            # Let the next burst accumulate before decoding again
+            if stop.wait(self.PARSE_INTERVAL):
+                break
+    
+    def _decode_pending(self):
+        """
+        Drain the queue and decode the newest frame of each ID
+        
+        Every fuel frame of the pass is kept for the consumption integrator,
+        so no flow samples are lost to coalescing. Frames whose payload
+        matches the last one decoded for their ID are skipped; ECUs resend
+        static values (gear in Park, fuel level) far faster than they change.
+        """
+        queue = self._rx_queue
+        if not queue:
+            return
+        
+        latest = {}
+        fuel_id = self.MSG_FUEL_SYSTEM
+        fuel_frames = []
+        popleft = queue.popleft
+        try:
+            while True:
+                msg = popleft()
+                can_id = msg.arbitration_id
+                latest[can_id] = msg
+                if can_id == fuel_id:
+                    fuel_frames.append(msg)
+        except IndexError:
+            pass
+        
+        # One clock read per pass, shared by fuel integration and auto-reset
+        now_ns = time.monotonic_ns()
+        
+        if fuel_frames:
+            try:
+                self._integrate_fuel_flow(fuel_frames, now_ns)
+            except Exception as e:
+                self._log_decode_error(fuel_id, e)
+        
+        decoders = self._decoders
+        last_raw = self._last_raw
+        for can_id, msg in latest.items():
+            data = msg.data
+            if data == last_raw.get(can_id):
+                continue
+            # Guard each decoder alone so one bad frame does not cost the
+            # other IDs coalesced into this pass their update
+            try:
+                decoders[can_id](msg)
+            except Exception as e:
+                self._log_decode_error(can_id, e)
+            else:
+                last_raw[can_id] = data
+        
+        # Runs on every pass with fuel frames, changed or not, so the
+        # reset timer keeps advancing while the level holds steady
+        if fuel_frames and self._fuel_auto_reset:
+            try:
+                self._check_fuel_auto_reset(now_ns)
+            except Exception as e:
+                self._log_decode_error(fuel_id, e)
+        
+        self.vehicle_data.mark_updated(time.time())
+    
+    def _log_decode_error(self, can_id: int, error: Exception):
+        """Log a decoder failure, rate-limited per CAN ID"""
+        now = time.monotonic()
+        entry = self._decode_errors.get(can_id)
+        if entry is None:
+            entry = self._decode_errors[can_id] = [None, 0]
+        elif now - entry[0] < self.DECODE_ERROR_LOG_INTERVAL:
+            entry[1] += 1
+            return
+        
+        suppressed = entry[1]
+        entry[0] = now
+        entry[1] = 0
+        self.logger.error(
+            "Error decoding CAN ID 0x%03X: %s%s", can_id, error,
+            f" ({suppressed} similar errors suppressed)" if suppressed else "",
+            exc_info=True
+        )
+    
+    def _log_filter_mode(self):
+        """Report how CAN filtering is configured for Camaro messages"""
         if not self.use_filters:
             self.logger.info("CAN filters disabled by config; receiving all CAN frames")
             return
         
-        # Filter for only the messages we care about
-        filters = [
-            {"can_id": self.MSG_ENGINE_RPM_SPEED, "can_mask": 0x7FF},
-            {"can_id": self.MSG_ENGINE_COOLANT, "can_mask": 0x7FF},
-            {"can_id": self.MSG_ENGINE_DATA, "can_mask": 0x7FF},
-            {"can_id": self.MSG_TRANSMISSION, "can_mask": 0x7FF},
-            {"can_id": self.MSG_FUEL_SYSTEM, "can_mask": 0x7FF},
-            {"can_id": self.MSG_BCM_DATA, "can_mask": 0x7FF},
-        ]
-        
-        self.canbus.set_filters(filters)
         self.logger.info("Set up CAN filters for Camaro messages")
     
-    def _handle_engine_rpm_speed(self, msg: CANMessage):
+    def _handle_engine_rpm_speed(self, msg: can.Message):
         """
         Handle engine RPM and vehicle speed message
         
@@ -191,37 +443,31 @@ class CamaroCANBus:
         Byte 0-1: Engine RPM (RPM = value / 4)
         Byte 2-3: Vehicle Speed (km/h)
         """
-        try:
-            if len(msg.data) >= 4:
-                # Engine RPM (bytes 0-1, big-endian)
-                rpm_raw = (msg.data[0] << 8) | msg.data[1]
-                self.vehicle_data.rpm = int(rpm_raw / 4)
-                
-                # Vehicle speed (bytes 2-3, big-endian)
-                speed_raw = (msg.data[2] << 8) | msg.data[3]
-                self.vehicle_data.vehicle_speed = speed_raw / 100.0
-                
-                self.vehicle_data.last_update = time.time()
-                
-        except Exception as e:
-            self.logger.error(f"Error parsing RPM/Speed message: {e}")
+        data = msg.data
+        if len(data) >= 4:
+            vd = self.vehicle_data
+            # Engine RPM (bytes 0-1) and vehicle speed (bytes 2-3)
+            rpm_raw, speed_raw = _RPM_SPEED.unpack_from(data)
+            vd.rpm = rpm_raw >> 2
+            
+            speed_kph = speed_raw / 100.0
+            vd.vehicle_speed = speed_kph
+            vd.vehicle_speed_mph = speed_kph * KPH_TO_MPH
     
-    def _handle_coolant_temp(self, msg: CANMessage):
+    def _handle_coolant_temp(self, msg: can.Message):
         """
         Handle coolant temperature message
         
         Typical format (GM):
         Byte 0: Coolant temp (Celsius = value - 40)
         """
-        try:
-            if len(msg.data) >= 1:
-                self.vehicle_data.coolant_temp = msg.data[0] - 40
-                self.vehicle_data.last_update = time.time()
-                
-        except Exception as e:
-            self.logger.error(f"Error parsing coolant temp message: {e}")
+        data = msg.data
+        if len(data) >= 1:
+            vd = self.vehicle_data
+            vd.coolant_temp = data[0] - 40
+            vd.coolant_temp_f = _RAW_TEMP_TO_F[data[0]]
     
-    def _handle_engine_data(self, msg: CANMessage):
+    def _handle_engine_data(self, msg: can.Message):
         """
         Handle engine operating data message
         
@@ -230,34 +476,29 @@ class CamaroCANBus:
         Byte 1: Manifold pressure (kPa)
         Byte 2: Intake air temp (Celsius = value - 40)
         """
-        try:
-            if len(msg.data) >= 3:
-                self.vehicle_data.throttle_position = (msg.data[0] / 255.0) * 100.0
-                self.vehicle_data.manifold_pressure = msg.data[1]
-                self.vehicle_data.intake_air_temp = msg.data[2] - 40
-                self.vehicle_data.last_update = time.time()
-                
-        except Exception as e:
-            self.logger.error(f"Error parsing engine data message: {e}")
-    
-    def _handle_transmission(self, msg: CANMessage):
+        data = msg.data
+        if len(data) >= 3:
+            vd = self.vehicle_data
+            vd.throttle_position = (data[0] / 255.0) * 100.0
+            vd.manifold_pressure = data[1]
+            vd.intake_air_temp = data[2] - 40
+            vd.intake_air_temp_f = _RAW_TEMP_TO_F[data[2]]
+    
+    def _handle_transmission(self, msg: can.Message):
         """
         Handle transmission data message
         
         Typical format (GM):
         Byte 0: Current gear
         """
-        try:
-            if len(msg.data) >= 1:
-                gear = msg.data[0]
-                # Gear 0 = Park/Neutral, 1-6 = gears
-                self.vehicle_data.transmission_gear = gear if gear <= 6 else None
-                self.vehicle_data.last_update = time.time()
-                
-        except Exception as e:
-            self.logger.error(f"Error parsing transmission message: {e}")
-    
-    def _handle_fuel_system(self, msg: CANMessage):
+        data = msg.data
+        if len(data) >= 1:
+            vd = self.vehicle_data
+            gear = data[0]
+            # Gear 0 = Park/Neutral, 1-6 = gears
+            vd.transmission_gear = gear if gear <= 6 else None
+    
+    def _handle_fuel_system(self, msg: can.Message):
         """
         Handle fuel system data message
         
@@ -265,57 +506,60 @@ class CamaroCANBus:
         Byte 0: Fuel level (percent = value / 2.55)
         Byte 1-2: Fuel flow rate
         """
-        try:
-            current_time = time.time()
+        data = msg.data
+        data_len = len(data)
+        vd = self.vehicle_data
+        
+        # Parse fuel level
+        if data_len >= 1:
+            vd.fuel_level = (data[0] / 255.0) * 100.0
+        
+        # Latest fuel flow rate; consumption is integrated per pass
+        if data_len >= 3:
+            flow_raw, = _FUEL_FLOW.unpack_from(data)
+            # Apply conversion factor from config (adjustable for testing)
+            vd.fuel_flow_rate = flow_raw * self._fuel_flow_factor  # L/h
+    
+    def _integrate_fuel_flow(self, frames: list, now_ns: int):
+        """
+        Add the fuel consumed since the previous pass
+        
+        Uses the mean flow rate of all fuel frames received during the pass
+        over the time elapsed since the last integration.
+        """
+        unpack = _FUEL_FLOW.unpack_from
+        total_raw = 0
+        samples = 0
+        for msg in frames:
+            data = msg.data
+            if len(data) >= 3:
+                total_raw += unpack(data)[0]
+                samples += 1
+        if not samples:
+            return
+        
+        vd = self.vehicle_data
+        flow_rate = total_raw * self._fuel_flow_factor / samples  # L/h
+        
+        if vd.last_fuel_update_ns is not None and flow_rate > 0:
+            # Time elapsed since last update (in hours)
+            time_delta_hours = (now_ns - vd.last_fuel_update_ns) * NS_TO_HOURS
             
-            # Parse fuel level
-            if len(msg.data) >= 1:
-                self.vehicle_data.fuel_level = (msg.data[0] / 255.0) * 100.0
+            # Fuel consumed in this interval (liters)
+            fuel_delta = flow_rate * time_delta_hours
             
-            # Parse fuel flow rate and calculate consumption
-            if len(msg.data) >= 3:
-                # Decode fuel flow rate
-                flow_raw = (msg.data[1] << 8) | msg.data[2]
-                # Apply conversion factor from config (adjustable for testing)
-                conversion_factor = getattr(
-                    self.config, 
-                    'fuel_flow_conversion_factor', 
-                    0.01  # Default fallback
-                )
-                self.vehicle_data.fuel_flow_rate = flow_raw * conversion_factor  # L/h
-                
-                # Calculate fuel consumed since last update
-                if (self.vehicle_data.last_fuel_update_time is not None and 
-                    self.vehicle_data.fuel_flow_rate is not None and
-                    self.vehicle_data.fuel_flow_rate > 0):
-                    
-                    # Time elapsed since last update (in hours)
-                    time_delta_hours = (current_time - self.vehicle_data.last_fuel_update_time) / 3600.0
-                    
-                    # Fuel consumed in this interval (liters)
-                    fuel_delta = self.vehicle_data.fuel_flow_rate * time_delta_hours
-                    
-                    # Add to cumulative total
-                    self.vehicle_data.fuel_consumed_liters += fuel_delta
-                    
-                    self.logger.debug(
-                        f"Fuel: flow={self.vehicle_data.fuel_flow_rate:.2f} L/h, "
-                        f"delta={fuel_delta:.6f} L, total={self.vehicle_data.fuel_consumed_liters:.3f} L"
-                    )
-                
-                # Update timestamp for next calculation
-                self.vehicle_data.last_fuel_update_time = current_time
+            # Add to cumulative total
+            vd.fuel_consumed_liters += fuel_delta
             
-            # Check for auto-reset when fuel tank is filled
-            if getattr(self.config, 'fuel_auto_reset_enabled', False):
-                self._check_fuel_auto_reset(current_time)
-                
-            self.vehicle_data.last_update = current_time
-                
-        except Exception as e:
-            self.logger.error(f"Error parsing fuel system message: {e}")
+            self.logger.debug(
+                "Fuel: flow=%.2f L/h (%d samples), delta=%.6f L, total=%.3f L",
+                flow_rate, samples, fuel_delta, vd.fuel_consumed_liters
+            )
+        
+        # Update timestamp for next calculation
+        vd.last_fuel_update_ns = now_ns
     
-    def _handle_bcm_data(self, msg: CANMessage):
+    def _handle_bcm_data(self, msg: can.Message):
         """
         Handle Body Control Module data message
         
@@ -323,21 +567,18 @@ class CamaroCANBus:
         Byte 0: Various status bits including MIL
         Byte 4-5: Battery voltage (Volts = value / 1000)
         """
-        try:
-            if len(msg.data) >= 1:
-                # Check MIL status (bit 0 of byte 0)
-                self.vehicle_data.mil_status = bool(msg.data[0] & 0x01)
-            
-            if len(msg.data) >= 6:
-                voltage_raw = (msg.data[4] << 8) | msg.data[5]
-                self.vehicle_data.battery_voltage = voltage_raw / 1000.0
-                
-            self.vehicle_data.last_update = time.time()
-                
-        except Exception as e:
-            self.logger.error(f"Error parsing BCM data message: {e}")
+        data = msg.data
+        data_len = len(data)
+        vd = self.vehicle_data
+        if data_len >= 1:
+            # Check MIL status (bit 0 of byte 0)
+            vd.mil_status = bool(data[0] & 0x01)
+        
+        if data_len >= 6:
+            voltage_raw, = _BCM_VOLTAGE.unpack_from(data)
+            vd.battery_voltage = voltage_raw / 1000.0
     
-    def _check_fuel_auto_reset(self, current_time: float):
+    def _check_fuel_auto_reset(self, now_ns: int):
         """
         Check if fuel consumption should be auto-reset based on fuel level
         
@@ -345,50 +586,51 @@ class CamaroCANBus:
         then stay above threshold for configured duration. This prevents false
         resets when starting the car with a full tank.
         """
-        threshold = getattr(self.config, 'fuel_auto_reset_threshold', 95.0)
-        duration = getattr(self.config, 'fuel_auto_reset_duration', 5.0)
-        
-        if self.vehicle_data.fuel_level is not None:
-            # Track if we've ever been below the threshold (i.e., we've driven)
-            if self.vehicle_data.fuel_level < threshold:
-                self._fuel_was_below_threshold = True
-                # Cancel any active timer since we're below threshold
-                if self._fuel_reset_timer_start is not None:
-                    self.logger.debug(
-                        f"Fuel level dropped to {self.vehicle_data.fuel_level:.1f}% - "
-                        f"canceling auto-reset timer"
-                    )
-                    self._fuel_reset_timer_start = None
-            
-            # Only consider reset if we've previously been below threshold
-            # This ensures we detect the TRANSITION from low to high (refueling)
-            elif self.vehicle_data.fuel_level >= threshold and self._fuel_was_below_threshold:
-                # Fuel level is above threshold AND we've driven before
-                if self._fuel_reset_timer_start is None:
-                    # Start the timer - detected potential refueling
-                    self._fuel_reset_timer_start = current_time
-                    self.logger.info(
-                        f"Fuel level at {self.vehicle_data.fuel_level:.1f}% after being below "
-                        f"{threshold:.1f}% - starting auto-reset timer ({duration:.1f}s)"
-                    )
-                elif (current_time - self._fuel_reset_timer_start) >= duration:
-                    # Timer has elapsed - confirmed refueling, reset fuel consumption
-                    old_consumed = self.vehicle_data.fuel_consumed_liters
-                    self.reset_fuel_consumption()
-                    # Also reset the "was below" flag so we need another transition
-                    self._fuel_was_below_threshold = False
-                    self.logger.info(
-                        f"Auto-reset fuel consumption triggered "
-                        f"(was {old_consumed:.3f} L, fuel level {self.vehicle_data.fuel_level:.1f}%)"
-                    )
+        fuel_level = self.vehicle_data.fuel_level
+        if fuel_level is None:
+            return
+        
+        self._fuel_state, action = _FUEL_TRANSITIONS[self._fuel_state][
+            fuel_level >= self._fuel_threshold
+        ]
+        if action == _FUEL_NONE:
+            return
+        
+        if action == _FUEL_CHECK_TIMER:
+            if (now_ns - self._fuel_reset_timer_start) >= self._fuel_duration_ns:
+                # Timer has elapsed - confirmed refueling, reset fuel consumption
+                old_consumed = self.vehicle_data.fuel_consumed_liters
+                self.reset_fuel_consumption()
+                # Require another below -> above transition before the next reset
+                self._fuel_state = FUEL_IDLE
+                self.logger.info(
+                    "Auto-reset fuel consumption triggered "
+                    "(was %.3f L, fuel level %.1f%%)",
+                    old_consumed, fuel_level
+                )
+        elif action == _FUEL_START_TIMER:
+            # Detected potential refueling
+            self._fuel_reset_timer_start = now_ns
+            self.logger.info(
+                "Fuel level at %.1f%% after being below %.1f%% - "
+                "starting auto-reset timer (%.1fs)",
+                fuel_level, self._fuel_threshold, self._fuel_duration
+            )
+        else:  # _FUEL_CANCEL_TIMER
+            self.logger.debug(
+                "Fuel level dropped to %.1f%% - canceling auto-reset timer",
+                fuel_level
+            )
     
     def reset_fuel_consumption(self):
         """Manually reset fuel consumption counter"""
         self.vehicle_data.fuel_consumed_liters = 0.0
-        self.vehicle_data.last_fuel_update_time = time.time()
-        self._fuel_reset_timer_start = None
-        # Don't reset _fuel_was_below_threshold on manual reset
-        # This allows manual reset even with full tank
+        self.vehicle_data.last_fuel_update_ns = time.monotonic_ns()
+        self.vehicle_data.invalidate()
+        # Cancel a running timer but keep the "been below" history, so a
+        # manual reset works even with a full tank
+        if self._fuel_state == FUEL_PENDING:
+            self._fuel_state = FUEL_BELOW
         self.logger.info("Fuel consumption counter reset to 0.0 L")
     
     def get_fuel_consumed_gallons(self, apply_safety_margin: bool = True) -> float:
@@ -402,11 +644,10 @@ class CamaroCANBus:
             Fuel consumed in gallons
         """
         liters = self.vehicle_data.fuel_consumed_liters
-        gallons = liters / 3.78541  # Convert L to gallons
+        gallons = liters / LITERS_PER_GALLON  # Convert L to gallons
         
         if apply_safety_margin:
-            safety_margin = getattr(self.config, 'fuel_safety_margin', 1.025)
-            gallons *= safety_margin
+            gallons *= self._fuel_safety_margin
         
         return gallons
     
@@ -423,15 +664,14 @@ class CamaroCANBus:
         liters = self.vehicle_data.fuel_consumed_liters
         
         if apply_safety_margin:
-            safety_margin = getattr(self.config, 'fuel_safety_margin', 1.025)
-            liters *= safety_margin
+            liters *= self._fuel_safety_margin
         
         return liters
     
     def has_valid_fuel_data(self) -> bool:
         """Check if we have valid fuel consumption data"""
         return (
-            self.vehicle_data.last_fuel_update_time is not None and
+            self.vehicle_data.last_fuel_update_ns is not None and
             self.vehicle_data.fuel_flow_rate is not None
         )
     
@@ -445,15 +685,11 @@ class CamaroCANBus:
     
     def get_speed_mph(self) -> Optional[float]:
         """Get vehicle speed in MPH"""
-        if self.vehicle_data.vehicle_speed is not None:
-            return self.vehicle_data.vehicle_speed * 0.621371
-        return None
+        return self.vehicle_data.vehicle_speed_mph
     
     def get_coolant_temp_f(self) -> Optional[float]:
         """Get coolant temperature in Fahrenheit"""
-        if self.vehicle_data.coolant_temp is not None:
-            return self.vehicle_data.coolant_temp * 9/5 + 32
-        return None
+        return self.vehicle_data.coolant_temp_f
     
     def is_engine_running(self) -> bool:
         """Check if engine is running (RPM > 0)"""
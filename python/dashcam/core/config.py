@@ -4,35 +4,355 @@ All configurable settings for the dashcam system
 """
 
 import os
-from typing import Any, Dict, Tuple
+import sys
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Tuple
 
 import yaml
 
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None
+
 
 CONFIG_PATH = os.environ.get("DASHCAM_CONFIG", "/etc/dashcam/config.yaml")
+BASE_DIR = os.environ.get("DASHCAM_BASE_DIR", "/opt/dashcam")
+
+# libyaml-backed loader when PyYAML was built with it; same safe semantics
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Settings validate() requires to be positive, with the error for each
+_POSITIVE_SETTINGS = (
+    ("front_camera_width", "Invalid front camera width"),
+    ("front_camera_height", "Invalid front camera height"),
+    ("front_camera_fps", "Invalid front camera FPS"),
+    ("rear_camera_width", "Invalid rear camera width"),
+    ("rear_camera_height", "Invalid rear camera height"),
+    ("rear_camera_fps", "Invalid rear camera FPS"),
+    ("video_segment_duration", "Segment duration must be positive"),
+    ("front_camera_bitrate", "Front camera bitrate must be positive"),
+    ("rear_camera_bitrate", "Rear camera bitrate must be positive"),
+    ("display_width", "Invalid display width"),
+    ("display_height", "Invalid display height"),
+)
+
+
+# YAML section/key -> Config attribute. A (width, height) tuple target takes
+# a two-element resolution list.
+_SECTION_MAPPING = {
+    "paths": {
+        "base_dir": "base_dir",
+        "video_dir": "video_dir",
+        "current_dir": "video_current_dir",
+        "archive_dir": "video_archive_dir",
+        "log_dir": "log_dir",
+    },
+    "video": {
+        "codec": "video_codec",
+        "front_bitrate": "front_camera_bitrate",
+        "rear_bitrate": "rear_camera_bitrate",
+        "segment_duration": "video_segment_duration",
+        "front_prefix": "front_camera_prefix",
+        "rear_prefix": "rear_camera_prefix",
+        "disk_high_water_mark": "disk_high_water_mark",
+        "keep_minimum_gb": "keep_minimum_gb",
+    },
+    "cameras": {
+        "front": {
+            "enabled": "front_camera_enabled",
+            "index": "front_camera_index",
+            "resolution": ("front_camera_width", "front_camera_height"),
+            "fps": "front_camera_fps",
+            "recording_enabled": "front_camera_recording_enabled",
+            "bitrate": "front_camera_bitrate",
+            "rotation": "front_camera_rotation",
+            "hflip": "front_camera_hflip",
+            "vflip": "front_camera_vflip",
+        },
+        "rear": {
+            "enabled": "rear_camera_enabled",
+            "index": "rear_camera_index",
+            "resolution": ("rear_camera_width", "rear_camera_height"),
+            "fps": "rear_camera_fps",
+            "recording_enabled": "rear_camera_recording_enabled",
+            "bitrate": "rear_camera_bitrate",
+            "rotation": "rear_camera_rotation",
+            "hflip": "rear_camera_hflip",
+            "vflip": "rear_camera_vflip",
+        },
+        "display_camera_index": "display_camera_index",
+    },
+    "display": {
+        "resolution": ("display_width", "display_height"),
+        "fps": "display_fps",
+        "backend": "display_backend",
+        "drm_card": "display_drm_card",
+        "input_is_bgr": "display_input_is_bgr",
+        "use_framebuffer": "use_framebuffer",
+        "framebuffer_device": "framebuffer_device",
+        "fullscreen": "display_fullscreen",
+        "mirror_mode": "display_mirror_mode",
+    },
+    "overlay": {
+        "enabled": "overlay_enabled",
+        "time_format": "overlay_time_format",
+        "date_format": "overlay_date_format",
+        "time_pos": "overlay_time_pos",
+        "date_pos": "overlay_date_pos",
+        "speed_pos": "overlay_speed_pos",
+        "rec_indicator_pos": "overlay_rec_indicator_pos",
+        "can_status_pos": "overlay_can_status_pos",
+        "font_size": "overlay_font_size",
+        "font_color": "overlay_font_color",
+        "bg_color": "overlay_bg_color",
+        "bg_alpha": "overlay_bg_alpha",
+        "corner_radius": "overlay_corner_radius",
+        "shadow_enabled": "overlay_shadow_enabled",
+        "shadow_offset": "overlay_shadow_offset",
+        "shadow_alpha": "overlay_shadow_alpha",
+        "shadow_color": "overlay_shadow_color",
+        "outline": "overlay_outline",
+        "outline_color": "overlay_outline_color",
+        "rec_indicator_text": "rec_indicator_text",
+        "rec_indicator_color": "rec_indicator_color",
+        "rec_indicator_blink": "rec_indicator_blink",
+        "rec_indicator_blink_rate": "rec_indicator_blink_rate",
+        "can_status_disabled_text": "canbus_status_disabled_text",
+        "can_status_connecting_text": "canbus_status_connecting_text",
+        "can_status_connected_text": "canbus_status_connected_text",
+        "can_status_stale_timeout": "canbus_status_stale_timeout",
+    },
+    "gps": {
+        "enabled": "gps_enabled",
+        "device": "gps_device",
+        "baudrate": "gps_baudrate",
+        "timeout": "gps_timeout",
+        "log_interval": "gps_log_interval",
+        "log_max_gap": "gps_log_max_gap",
+        "display_speed": "display_speed",
+        "speed_unit": "speed_unit",
+        "speed_recording_enabled": "speed_recording_enabled",
+        "start_recording_speed_mph": "start_recording_speed_mph",
+        "stop_recording_delay_seconds": "stop_recording_delay_seconds",
+        "retry_attempts": "gps_retry_attempts",
+        "retry_delay": "gps_retry_delay",
+        "gps_required": "gps_required",
+    },
+    "canbus": {
+        "enabled": "canbus_enabled",
+        "channel": "canbus_channel",
+        "bitrate": "canbus_bitrate",
+        "vehicle_type": "canbus_vehicle_type",
+        "display_data": "display_canbus_data",
+        "overlay_position": "canbus_overlay_position",
+        "record_data": "record_canbus_data",
+        "log_interval": "canbus_log_interval",
+        "use_filters": "canbus_use_filters",
+        "no_traffic_warning_seconds": "canbus_no_traffic_warning_seconds",
+        "no_traffic_warning_repeat_seconds": "canbus_no_traffic_warning_repeat_seconds",
+        "stats_log_interval": "canbus_stats_log_interval",
+    },
+    "fuel": {
+        "display_fuel_consumed": "display_fuel_consumed",
+        "overlay_position": "fuel_overlay_position",
+        "flow_conversion_factor": "fuel_flow_conversion_factor",
+        "safety_margin": "fuel_safety_margin",
+        "auto_reset_enabled": "fuel_auto_reset_enabled",
+        "auto_reset_threshold": "fuel_auto_reset_threshold",
+        "auto_reset_duration": "fuel_auto_reset_duration",
+        "display_unit": "fuel_display_unit",
+        "display_decimals": "fuel_display_decimals",
+    },
+    "performance": {
+        "camera_buffer_count": "camera_buffer_count",
+        "encoder_buffer_count": "encoder_buffer_count",
+        "use_threading": "use_threading",
+        "display_thread_priority": "display_thread_priority",
+        "frame_queue_size": "frame_queue_size",
+    },
+    "errors": {
+        "camera_retry_attempts": "camera_retry_attempts",
+        "camera_retry_delay": "camera_retry_delay",
+        "camera_failure_reboot": "camera_failure_reboot",
+        "continue_on_single_camera": "continue_on_single_camera",
+    },
+    "logging": {
+        "level": "log_level",
+        "backend": "log_backend",
+        "backup_count": "log_backup_count",
+        "to_console": "log_to_console",
+        "log_fps": "log_fps",
+        "log_dropped_frames": "log_dropped_frames",
+    },
+    "system": {
+        "startup_delay": "startup_delay",
+        "shutdown_grace_period": "shutdown_grace_period",
+        "watchdog_enabled": "watchdog_enabled",
+        "watchdog_timeout": "watchdog_timeout",
+        "cpu_governor": "cpu_governor",
+    },
+    "camera_control": {
+        "auto_exposure": "auto_exposure",
+        "auto_white_balance": "auto_white_balance",
+        "auto_focus": "auto_focus",
+        "exposure_time": "exposure_time",
+        "analog_gain": "analog_gain",
+        "awb_red_gain": "awb_red_gain",
+        "awb_blue_gain": "awb_blue_gain",
+        "contrast": "contrast",
+        "brightness": "brightness",
+        "saturation": "saturation",
+        "sharpness": "sharpness",
+    },
+}
+
+_SCALAR = 0
+_RESOLUTION = 1
+
+
+def _flatten_mapping(mapping: Dict[str, Any], prefix: Tuple[str, ...] = ()):
+    for key, target in mapping.items():
+        path = prefix + (key,)
+        if isinstance(target, dict):
+            yield from _flatten_mapping(target, path)
+        elif isinstance(target, tuple):
+            yield path, _RESOLUTION, target
+        else:
+            yield path, _SCALAR, target
+
+
+# (key path, kind, target) per setting, so loading is one flat pass
+_FLAT_MAPPING: Tuple[Tuple[Tuple[str, ...], int, Any], ...] = tuple(
+    _flatten_mapping(_SECTION_MAPPING)
+)
+
+
+# Position/offset and colour settings stored as int 2-/3-tuples
+_PAIR_FIELDS = (
+    "overlay_time_pos",
+    "overlay_date_pos",
+    "overlay_speed_pos",
+    "overlay_rec_indicator_pos",
+    "overlay_can_status_pos",
+    "overlay_shadow_offset",
+    "canbus_overlay_position",
+    "fuel_overlay_position",
+)
+_TRIPLE_FIELDS = (
+    "overlay_font_color",
+    "overlay_bg_color",
+    "overlay_shadow_color",
+    "overlay_outline_color",
+    "rec_indicator_color",
+)
 
 
 class Config:
     """Central configuration for dashcam system"""
 
+    # Every setting must be listed here as well as in _set_defaults()
+    __slots__ = (
+        "config_path", "_user_overrides", "_camera_configs", "_str_cache", "_frozen",
+        # Directory Configuration
+        "base_dir", "video_dir", "video_current_dir", "video_archive_dir", "log_dir",
+        "video_current_prefix", "video_archive_prefix", "log_prefix",
+        # Camera Configuration - Dual CSI Setup
+        "front_camera_enabled", "front_camera_index", "front_camera_width",
+        "front_camera_height", "front_camera_fps", "front_camera_recording_enabled",
+        "rear_camera_enabled", "rear_camera_index", "rear_camera_width",
+        "rear_camera_height", "rear_camera_fps", "rear_camera_recording_enabled",
+        "display_camera_index",
+        # Camera-specific settings
+        "front_camera_rotation", "front_camera_hflip", "front_camera_vflip",
+        "rear_camera_rotation", "rear_camera_hflip", "rear_camera_vflip",
+        # Video Recording Configuration
+        "video_codec", "front_camera_bitrate", "rear_camera_bitrate",
+        "front_camera_bitrate_mbps", "rear_camera_bitrate_mbps",
+        "video_segment_duration", "front_camera_prefix", "rear_camera_prefix",
+        "disk_high_water_mark", "keep_minimum_gb",
+        # Display Configuration
+        "display_width", "display_height", "display_fps", "display_backend",
+        "display_drm_card", "display_input_is_bgr", "use_framebuffer",
+        "framebuffer_device", "display_fullscreen", "display_mirror_mode",
+        # Overlay Configuration
+        "overlay_enabled", "overlay_time_format", "overlay_date_format",
+        "overlay_time_pos", "overlay_date_pos", "overlay_speed_pos",
+        "overlay_rec_indicator_pos", "overlay_can_status_pos", "overlay_font_size",
+        "overlay_font_color", "overlay_bg_color", "overlay_bg_alpha",
+        "overlay_corner_radius", "overlay_shadow_enabled", "overlay_shadow_offset",
+        "overlay_shadow_alpha", "overlay_shadow_color", "overlay_outline",
+        "overlay_outline_color", "rec_indicator_text", "rec_indicator_color",
+        "rec_indicator_blink", "rec_indicator_blink_rate",
+        "canbus_status_disabled_text", "canbus_status_connecting_text",
+        "canbus_status_connected_text", "canbus_status_stale_timeout",
+        # GPS Configuration
+        "gps_enabled", "gps_device", "gps_baudrate", "gps_timeout", "gps_log_interval",
+        "gps_log_max_gap",
+        "display_speed", "speed_unit", "speed_recording_enabled",
+        "start_recording_speed_mph", "stop_recording_delay_seconds",
+        # CAN Bus Configuration
+        "canbus_enabled", "canbus_channel", "canbus_bitrate", "canbus_vehicle_type",
+        "display_canbus_data", "canbus_overlay_position", "record_canbus_data",
+        "canbus_log_interval", "canbus_use_filters",
+        "canbus_no_traffic_warning_seconds", "canbus_no_traffic_warning_repeat_seconds",
+        "canbus_stats_log_interval",
+        # Fuel Consumption Configuration
+        "display_fuel_consumed", "fuel_overlay_position", "fuel_flow_conversion_factor",
+        "fuel_safety_margin", "fuel_auto_reset_enabled", "fuel_auto_reset_threshold",
+        "fuel_auto_reset_duration", "fuel_display_unit", "fuel_display_decimals",
+        # Performance Configuration
+        "camera_buffer_count", "encoder_buffer_count", "use_threading",
+        "display_thread_priority", "frame_queue_size",
+        # Error Handling Configuration
+        "camera_retry_attempts", "camera_retry_delay", "camera_failure_reboot",
+        "continue_on_single_camera", "gps_retry_attempts", "gps_retry_delay",
+        "gps_required",
+        # Logging Configuration
+        "log_level", "log_backend", "log_backup_count",
+        "log_to_console", "log_fps", "log_dropped_frames",
+        # System Configuration
+        "startup_delay", "shutdown_grace_period", "watchdog_enabled",
+        "watchdog_timeout", "cpu_governor",
+        # Advanced Camera Configuration
+        "auto_exposure", "auto_white_balance", "auto_focus", "exposure_time",
+        "analog_gain", "awb_red_gain", "awb_blue_gain", "contrast", "brightness",
+        "saturation", "sharpness",
+    )
+
     def __init__(self, config_path: str | None = None):
+        self._frozen = False
         self.config_path = config_path or CONFIG_PATH
         self._user_overrides: set[str] = set()
+        self._camera_configs: Dict[int, Mapping[str, Any]] | None = None
+        self._str_cache: str | None = None
         self._set_defaults()
         self._load_from_yaml(self.config_path)
         self._finalize_paths()
         self._normalize_sequences()
+        self._derive_values()
+
+    def __setattr__(self, name: str, value: Any):
+        # Settings are read-only once validate() has run, so components may
+        # copy them into locals at startup without going stale. Private
+        # caches (leading underscore) stay writable.
+        if name[0] != "_" and self._frozen:
+            raise AttributeError(f"Config is frozen; cannot set '{name}'")
+        object.__setattr__(self, name, value)
 
     # ==========================================
     # Default values
     # ==========================================
     def _set_defaults(self):
         # Directory Configuration
-        self.base_dir = os.environ.get("DASHCAM_BASE_DIR", "/opt/dashcam")
-        self.video_dir = os.path.join(self.base_dir, "videos")
-        self.video_current_dir = os.path.join(self.video_dir, "current")
-        self.video_archive_dir = os.path.join(self.video_dir, "archive")
-        self.log_dir = os.path.join(self.base_dir, "logs")
+        # Paths under base_dir are built by plain concatenation; the layout
+        # is fixed, so os.path.join's per-argument checks buy nothing
+        self.base_dir = BASE_DIR
+        base = self.base_dir.rstrip(os.sep)
+        self.video_dir = f"{base}{os.sep}videos"
+        self.video_current_dir = f"{self.video_dir}{os.sep}current"
+        self.video_archive_dir = f"{self.video_dir}{os.sep}archive"
+        self.log_dir = f"{base}{os.sep}logs"
 
         # Camera Configuration - Dual CSI Setup
         self.front_camera_enabled = True
@@ -117,6 +437,7 @@ class Config:
         self.gps_baudrate = 115200
         self.gps_timeout = 1.0
         self.gps_log_interval = 1.0
+        self.gps_log_max_gap = 30.0  # stationary fixes logged at least this often; 0 logs every interval
         self.display_speed = True
         self.speed_unit = "mph"
         self.speed_recording_enabled = True
@@ -166,7 +487,7 @@ class Config:
 
         # Logging Configuration
         self.log_level = "INFO"
-        self.log_max_size = 10 * 1024 * 1024
+        self.log_backend = "file"  # "file" or "syslog" (journald)
         self.log_backup_count = 5
         self.log_to_console = True
         self.log_fps = True
@@ -196,6 +517,10 @@ class Config:
     # YAML loading
     # ==========================================
     def _apply_value(self, attr: str, value: Any):
+        # Intern YAML strings so per-frame comparisons against literals
+        # (speed_unit == "mph", ...) can short-circuit on identity
+        if isinstance(value, str):
+            value = sys.intern(value)
         setattr(self, attr, value)
         self._user_overrides.add(attr)
 
@@ -206,291 +531,147 @@ class Config:
                 self._apply_value(attr_width, int(values[0]))
                 self._apply_value(attr_height, int(values[1]))
 
-    def _apply_section(self, data: Dict[str, Any], mapping: Dict[str, Any]):
-        for key, target in mapping.items():
-            if key not in data:
-                continue
-            value = data[key]
-            if isinstance(target, dict):
-                if isinstance(value, dict):
-                    self._apply_section(value, target)
-                continue
-            if isinstance(target, tuple) and len(target) == 2:
-                self._apply_resolution(target[0], target[1], value)
-            else:
-                self._apply_value(target, value)
-
     def _load_from_yaml(self, config_path: str | None):
-        if not config_path or not os.path.exists(config_path):
+        if not config_path:
             return
 
-        with open(config_path, "r", encoding="utf-8") as handle:
-            loaded = yaml.safe_load(handle) or {}
+        # A .toml file with the same sections/keys is also accepted; the
+        # stdlib C parser is faster than YAML
+        is_toml = config_path.endswith(".toml")
+        if is_toml and tomllib is None:
+            raise ValueError("TOML configuration files require Python 3.11+")
+
+        # open() doubles as the existence check, saving a separate stat
+        try:
+            handle = open(config_path, "rb")
+        except FileNotFoundError:
+            return
+        with handle:
+            if is_toml:
+                loaded = tomllib.load(handle)
+            else:
+                loaded = yaml.load(handle, Loader=_YAML_LOADER) or {}
 
         if not isinstance(loaded, dict):
             raise ValueError("Configuration file must contain a top-level mapping")
 
-        mapping = {
-            "paths": {
-                "base_dir": "base_dir",
-                "video_dir": "video_dir",
-                "current_dir": "video_current_dir",
-                "archive_dir": "video_archive_dir",
-                "log_dir": "log_dir",
-            },
-            "video": {
-                "codec": "video_codec",
-                "front_bitrate": "front_camera_bitrate",
-                "rear_bitrate": "rear_camera_bitrate",
-                "segment_duration": "video_segment_duration",
-                "front_prefix": "front_camera_prefix",
-                "rear_prefix": "rear_camera_prefix",
-                "disk_high_water_mark": "disk_high_water_mark",
-                "keep_minimum_gb": "keep_minimum_gb",
-            },
-            "cameras": {
-                "front": {
-                    "enabled": "front_camera_enabled",
-                    "index": "front_camera_index",
-                    "resolution": ("front_camera_width", "front_camera_height"),
-                    "fps": "front_camera_fps",
-                    "recording_enabled": "front_camera_recording_enabled",
-                    "bitrate": "front_camera_bitrate",
-                    "rotation": "front_camera_rotation",
-                    "hflip": "front_camera_hflip",
-                    "vflip": "front_camera_vflip",
-                },
-                "rear": {
-                    "enabled": "rear_camera_enabled",
-                    "index": "rear_camera_index",
-                    "resolution": ("rear_camera_width", "rear_camera_height"),
-                    "fps": "rear_camera_fps",
-                    "recording_enabled": "rear_camera_recording_enabled",
-                    "bitrate": "rear_camera_bitrate",
-                    "rotation": "rear_camera_rotation",
-                    "hflip": "rear_camera_hflip",
-                    "vflip": "rear_camera_vflip",
-                },
-                "display_camera_index": "display_camera_index",
-            },
-            "display": {
-                "resolution": ("display_width", "display_height"),
-                "fps": "display_fps",
-                "backend": "display_backend",
-                "drm_card": "display_drm_card",
-                "input_is_bgr": "display_input_is_bgr",
-                "use_framebuffer": "use_framebuffer",
-                "framebuffer_device": "framebuffer_device",
-                "fullscreen": "display_fullscreen",
-                "mirror_mode": "display_mirror_mode",
-            },
-            "overlay": {
-                "enabled": "overlay_enabled",
-                "time_format": "overlay_time_format",
-                "date_format": "overlay_date_format",
-                "time_pos": "overlay_time_pos",
-                "date_pos": "overlay_date_pos",
-                "speed_pos": "overlay_speed_pos",
-                "rec_indicator_pos": "overlay_rec_indicator_pos",
-                "can_status_pos": "overlay_can_status_pos",
-                "font_size": "overlay_font_size",
-                "font_color": "overlay_font_color",
-                "bg_color": "overlay_bg_color",
-                "bg_alpha": "overlay_bg_alpha",
-                "corner_radius": "overlay_corner_radius",
-                "shadow_enabled": "overlay_shadow_enabled",
-                "shadow_offset": "overlay_shadow_offset",
-                "shadow_alpha": "overlay_shadow_alpha",
-                "shadow_color": "overlay_shadow_color",
-                "outline": "overlay_outline",
-                "outline_color": "overlay_outline_color",
-                "rec_indicator_text": "rec_indicator_text",
-                "rec_indicator_color": "rec_indicator_color",
-                "rec_indicator_blink": "rec_indicator_blink",
-                "rec_indicator_blink_rate": "rec_indicator_blink_rate",
-                "can_status_disabled_text": "canbus_status_disabled_text",
-                "can_status_connecting_text": "canbus_status_connecting_text",
-                "can_status_connected_text": "canbus_status_connected_text",
-                "can_status_stale_timeout": "canbus_status_stale_timeout",
-            },
-            "gps": {
-                "enabled": "gps_enabled",
-                "device": "gps_device",
-                "baudrate": "gps_baudrate",
-                "timeout": "gps_timeout",
-                "log_interval": "gps_log_interval",
-                "display_speed": "display_speed",
-                "speed_unit": "speed_unit",
-                "speed_recording_enabled": "speed_recording_enabled",
-                "start_recording_speed_mph": "start_recording_speed_mph",
-                "stop_recording_delay_seconds": "stop_recording_delay_seconds",
-                "retry_attempts": "gps_retry_attempts",
-                "retry_delay": "gps_retry_delay",
-                "gps_required": "gps_required",
-            },
-            "canbus": {
-                "enabled": "canbus_enabled",
-                "channel": "canbus_channel",
-                "bitrate": "canbus_bitrate",
-                "vehicle_type": "canbus_vehicle_type",
-                "display_data": "display_canbus_data",
-                "overlay_position": "canbus_overlay_position",
-                "record_data": "record_canbus_data",
-                "log_interval": "canbus_log_interval",
-                "use_filters": "canbus_use_filters",
-                "no_traffic_warning_seconds": "canbus_no_traffic_warning_seconds",
-                "no_traffic_warning_repeat_seconds": "canbus_no_traffic_warning_repeat_seconds",
-                "stats_log_interval": "canbus_stats_log_interval",
-            },
-            "fuel": {
-                "display_fuel_consumed": "display_fuel_consumed",
-                "overlay_position": "fuel_overlay_position",
-                "flow_conversion_factor": "fuel_flow_conversion_factor",
-                "safety_margin": "fuel_safety_margin",
-                "auto_reset_enabled": "fuel_auto_reset_enabled",
-                "auto_reset_threshold": "fuel_auto_reset_threshold",
-                "auto_reset_duration": "fuel_auto_reset_duration",
-                "display_unit": "fuel_display_unit",
-                "display_decimals": "fuel_display_decimals",
-            },
-            "performance": {
-                "camera_buffer_count": "camera_buffer_count",
-                "encoder_buffer_count": "encoder_buffer_count",
-                "use_threading": "use_threading",
-                "display_thread_priority": "display_thread_priority",
-                "frame_queue_size": "frame_queue_size",
-            },
-            "errors": {
-                "camera_retry_attempts": "camera_retry_attempts",
-                "camera_retry_delay": "camera_retry_delay",
-                "camera_failure_reboot": "camera_failure_reboot",
-                "continue_on_single_camera": "continue_on_single_camera",
-            },
-            "logging": {
-                "level": "log_level",
-                "max_size": "log_max_size",
-                "backup_count": "log_backup_count",
-                "to_console": "log_to_console",
-                "log_fps": "log_fps",
-                "log_dropped_frames": "log_dropped_frames",
-            },
-            "system": {
-                "startup_delay": "startup_delay",
-                "shutdown_grace_period": "shutdown_grace_period",
-                "watchdog_enabled": "watchdog_enabled",
-                "watchdog_timeout": "watchdog_timeout",
-                "cpu_governor": "cpu_governor",
-            },
-            "camera_control": {
-                "auto_exposure": "auto_exposure",
-                "auto_white_balance": "auto_white_balance",
-                "auto_focus": "auto_focus",
-                "exposure_time": "exposure_time",
-                "analog_gain": "analog_gain",
-                "awb_red_gain": "awb_red_gain",
-                "awb_blue_gain": "awb_blue_gain",
-                "contrast": "contrast",
-                "brightness": "brightness",
-                "saturation": "saturation",
-                "sharpness": "sharpness",
-            },
-        }
-
-        for section, section_mapping in mapping.items():
-            if section in loaded and isinstance(loaded[section], dict):
-                self._apply_section(loaded[section], section_mapping)
+        for path, kind, target in _FLAT_MAPPING:
+            value = loaded
+            for key in path:
+                if not isinstance(value, dict) or key not in value:
+                    break
+                value = value[key]
+            else:
+                if kind == _RESOLUTION:
+                    self._apply_resolution(target[0], target[1], value)
+                else:
+                    self._apply_value(target, value)
 
     # ==========================================
     # Helpers
     # ==========================================
     def _finalize_paths(self):
+        sep = os.sep
+        base = self.base_dir.rstrip(sep)
         if "video_dir" not in self._user_overrides:
-            self.video_dir = os.path.join(self.base_dir, "videos")
+            self.video_dir = f"{base}{sep}videos"
+        video_dir = self.video_dir.rstrip(sep)
         if "video_current_dir" not in self._user_overrides:
-            self.video_current_dir = os.path.join(self.video_dir, "current")
+            self.video_current_dir = f"{video_dir}{sep}current"
         if "video_archive_dir" not in self._user_overrides:
-            self.video_archive_dir = os.path.join(self.video_dir, "archive")
+            self.video_archive_dir = f"{video_dir}{sep}archive"
         if "log_dir" not in self._user_overrides:
-            self.log_dir = os.path.join(self.base_dir, "logs")
+            self.log_dir = f"{base}{sep}logs"
+
+        # Directory + separator, so per-file paths are a plain concatenation
+        self.video_current_prefix = self.video_current_dir.rstrip(sep) + sep
+        self.video_archive_prefix = self.video_archive_dir.rstrip(sep) + sep
+        self.log_prefix = self.log_dir.rstrip(sep) + sep
 
-    def _as_tuple(self, value: Any, length: int) -> Tuple[int, ...]:
-        if isinstance(value, (list, tuple)) and len(value) >= length:
-            return tuple(int(value[i]) for i in range(length))
-        return tuple(int(value) for _ in range(length))
+    def _derive_values(self):
+        # Display-only conversions, done once instead of on every report
+        self.front_camera_bitrate_mbps = self.front_camera_bitrate / 1_000_000
+        self.rear_camera_bitrate_mbps = self.rear_camera_bitrate / 1_000_000
 
     def _normalize_sequences(self):
-        tuple_fields = {
-            "overlay_time_pos": 2,
-            "overlay_date_pos": 2,
-            "overlay_speed_pos": 2,
-            "overlay_rec_indicator_pos": 2,
-            "overlay_can_status_pos": 2,
-            "overlay_font_color": 3,
-            "overlay_bg_color": 3,
-            "overlay_shadow_offset": 2,
-            "overlay_shadow_color": 3,
-            "overlay_outline_color": 3,
-            "rec_indicator_color": 3,
-            "canbus_overlay_position": 2,
-            "fuel_overlay_position": 2,
-        }
-        for attr, length in tuple_fields.items():
-            value = getattr(self, attr, None)
-            if value is None:
-                continue
-            setattr(self, attr, self._as_tuple(value, length))
+        # Scalars are broadcast, sequences truncated, to fixed-size int tuples
+        for attr in _PAIR_FIELDS:
+            value = getattr(self, attr)
+            if isinstance(value, (list, tuple)) and len(value) >= 2:
+                setattr(self, attr, (int(value[0]), int(value[1])))
+            elif value is not None:
+                value = int(value)
+                setattr(self, attr, (value, value))
+        for attr in _TRIPLE_FIELDS:
+            value = getattr(self, attr)
+            if isinstance(value, (list, tuple)) and len(value) >= 3:
+                setattr(self, attr, (int(value[0]), int(value[1]), int(value[2])))
+            elif value is not None:
+                value = int(value)
+                setattr(self, attr, (value, value, value))
 
     # ==========================================
     # Validation and helpers
     # ==========================================
     def validate(self):
-        """Validate configuration and create directories if needed"""
-        os.makedirs(self.video_current_dir, exist_ok=True)
-        os.makedirs(self.video_archive_dir, exist_ok=True)
-        os.makedirs(self.log_dir, exist_ok=True)
+        """
+        Validate configuration and create directories if needed
 
-        assert self.front_camera_width > 0, "Invalid front camera width"
-        assert self.front_camera_height > 0, "Invalid front camera height"
-        assert self.front_camera_fps > 0, "Invalid front camera FPS"
+        Settings are frozen once validation passes; validating an already
+        frozen instance is a no-op.
+        """
+        if self._frozen:
+            return True
 
-        assert self.rear_camera_width > 0, "Invalid rear camera width"
-        assert self.rear_camera_height > 0, "Invalid rear camera height"
-        assert self.rear_camera_fps > 0, "Invalid rear camera FPS"
+        # Drop anything derived from settings changed before validation
+        self._str_cache = None
+        self._camera_configs = None
+        self._derive_values()
 
-        assert 0 < self.disk_high_water_mark < 1, "High water mark must be between 0 and 1"
-        assert self.video_segment_duration > 0, "Segment duration must be positive"
-        assert self.front_camera_bitrate > 0, "Front camera bitrate must be positive"
-        assert self.rear_camera_bitrate > 0, "Rear camera bitrate must be positive"
+        # One stat per directory in the common case where they all exist
+        for path in (self.video_current_dir, self.video_archive_dir, self.log_dir):
+            if not os.path.isdir(path):
+                os.makedirs(path, exist_ok=True)
 
-        assert self.display_width > 0, "Invalid display width"
-        assert self.display_height > 0, "Invalid display height"
+        # Explicit raises rather than asserts, so the checks survive python -O
+        for attr, message in _POSITIVE_SETTINGS:
+            if not getattr(self, attr) > 0:
+                raise ValueError(message)
 
-        assert self.front_camera_enabled or self.rear_camera_enabled, "At least one camera must be enabled"
+        if not 0 < self.disk_high_water_mark < 1:
+            raise ValueError("High water mark must be between 0 and 1")
+
+        if not (self.front_camera_enabled or self.rear_camera_enabled):
+            raise ValueError("At least one camera must be enabled")
 
         if self.display_camera_index == 0:
-            assert self.front_camera_enabled, "Display camera (front) must be enabled"
-        else:
-            assert self.rear_camera_enabled, "Display camera (rear) must be enabled"
+            if not self.front_camera_enabled:
+                raise ValueError("Display camera (front) must be enabled")
+        elif not self.rear_camera_enabled:
+            raise ValueError("Display camera (rear) must be enabled")
 
+        self._frozen = True
         return True
 
-    def get_camera_config(self, camera_index):
-        """Get configuration dictionary for a specific camera"""
-        if camera_index == self.front_camera_index:
-            return {
-                "index": self.front_camera_index,
-                "width": self.front_camera_width,
-                "height": self.front_camera_height,
-                "fps": self.front_camera_fps,
-                "rotation": self.front_camera_rotation,
-                "hflip": self.front_camera_hflip,
-                "vflip": self.front_camera_vflip,
-                "bitrate": self.front_camera_bitrate,
-                "prefix": self.front_camera_prefix,
-                "recording_enabled": self.front_camera_recording_enabled,
-            }
-        if camera_index == self.rear_camera_index:
-            return {
+    def get_camera_config(self, camera_index) -> Mapping[str, Any]:
+        """
+        Get configuration dictionary for a specific camera
+
+        The mappings are built on first use and shared read-only between
+        callers. validate() drops them, and settings are frozen after it.
+        """
+        camera_configs = self._camera_configs
+        if camera_configs is None:
+            camera_configs = self._camera_configs = self._build_camera_configs()
+        try:
+            return camera_configs[camera_index]
+        except KeyError:
+            raise ValueError(f"Invalid camera index: {camera_index}") from None
+
+    def _build_camera_configs(self) -> Dict[int, Mapping[str, Any]]:
+        # Rear first so the front camera wins if both share an index
+        return {
+            self.rear_camera_index: MappingProxyType({
                 "index": self.rear_camera_index,
                 "width": self.rear_camera_width,
                 "height": self.rear_camera_height,
@@ -501,11 +682,28 @@ class Config:
                 "bitrate": self.rear_camera_bitrate,
                 "prefix": self.rear_camera_prefix,
                 "recording_enabled": self.rear_camera_recording_enabled,
-            }
-        raise ValueError(f"Invalid camera index: {camera_index}")
+            }),
+            self.front_camera_index: MappingProxyType({
+                "index": self.front_camera_index,
+                "width": self.front_camera_width,
+                "height": self.front_camera_height,
+                "fps": self.front_camera_fps,
+                "rotation": self.front_camera_rotation,
+                "hflip": self.front_camera_hflip,
+                "vflip": self.front_camera_vflip,
+                "bitrate": self.front_camera_bitrate,
+                "prefix": self.front_camera_prefix,
+                "recording_enabled": self.front_camera_recording_enabled,
+            }),
+        }
 
     def __str__(self):
-        """String representation for debugging"""
+        """String representation for debugging (rendered once, reset by validate())"""
+        if self._str_cache is None:
+            self._str_cache = self._render_str()
+        return self._str_cache
+
+    def _render_str(self) -> str:
         return f"""
 Active Dash Mirror Configuration
 =================================
@@ -520,8 +718,8 @@ Display:
   Camera: {'Rear' if self.display_camera_index == 1 else 'Front'}
   Mirror Mode: {self.display_mirror_mode}
 Recording:
-  Front Bitrate: {self.front_camera_bitrate/1000000:.1f} Mbps
-  Rear Bitrate: {self.rear_camera_bitrate/1000000:.1f} Mbps
+  Front Bitrate: {self.front_camera_bitrate_mbps:.1f} Mbps
+  Rear Bitrate: {self.rear_camera_bitrate_mbps:.1f} Mbps
   Segment Duration: {self.video_segment_duration}s
 GPS:
   Enabled: {self.gps_enabled}
@@ -532,5 +730,22 @@ Storage:
 """
 
 
-# Global config instance
-config = Config()
+# Shared config instance, built on first use so importing this module
+# (e.g. just for the Config class) doesn't read the YAML file
+_config: Config | None = None
+
+
+def get_config() -> Config:
+    """Return the shared Config instance, loading it on first call"""
+    global _config
+    if _config is None:
+        _config = Config()
+    return _config
+
+
+def __getattr__(name: str):
+    # PEP 562: keep "from dashcam.core.config import config" working while
+    # still deferring the load until someone actually asks for it
+    if name == "config":
+        return get_config()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -18,9 +18,44 @@ except ImportError:
     GPS_AVAILABLE = False
     logging.warning("GPS libraries not available")
 
+# GPSD reports speed in m/s
+MS_TO_KPH = 3.6
+MS_TO_MPH = 3600.0 / 1609.344
+
+# Compact, C-accelerated encoder for the one-record-per-line GPS log
+_encode_record = json.JSONEncoder(separators=(',', ':'), check_circular=False).encode
+
+
+def _iso_utc(t: float) -> str:
+    """Format an epoch time like gpsd's TPV 'time' (UTC, milliseconds, 'Z')"""
+    return time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(t)) + '.%03dZ' % (int(t * 1000) % 1000)
+
 
 class GPSHandler:
     """Manages GPS communication and data logging"""
+
+    # Log records are buffered and flushed every LOG_FLUSH_RECORDS records
+    # or LOG_FLUSH_INTERVAL seconds, rather than once per fix
+    LOG_BUFFER_SIZE = 64 * 1024
+    LOG_FLUSH_RECORDS = 50
+    LOG_FLUSH_INTERVAL = 5.0
+
+    # While parked, fixes within these deltas of the last logged one are
+    # skipped until gps_log_max_gap seconds have passed
+    STATIONARY_DEGREES = 1e-5
+    STATIONARY_MPH = 0.1
+
+    __slots__ = (
+        "config", "logger", "enabled", "session", "running", "thread", "stop_event",
+        # GPS data
+        "latitude", "longitude", "speed_mph", "speed_kph", "altitude", "heading",
+        "fix_quality", "satellites", "timestamp", "has_fix",
+        # Logging
+        "log_file", "log_path", "next_log_time", "log_interval", "log_max_gap",
+        "_records_since_flush", "_last_flush", "_last_logged", "_last_logged_at",
+        # Recovery
+        "retry_count", "last_data_time",
+    )
     
     def __init__(self, config):
         self.config = config
@@ -56,8 +91,14 @@ class GPSHandler:
         
         # Logging
         self.log_file = None
-        self.log_path = os.path.join(config.log_dir, f"gps_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+        self.log_path = os.path.join(config.log_dir, f"gps_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl")
         self.next_log_time = None
+        self.log_interval = max(0.1, float(config.gps_log_interval))
+        self.log_max_gap = float(config.gps_log_max_gap)
+        self._last_logged = None
+        self._last_logged_at = 0.0
+        self._records_since_flush = 0
+        self._last_flush = 0.0
         
         # Recovery
         self.retry_count = 0
@@ -90,11 +131,14 @@ class GPSHandler:
             # Reset runtime state for a fresh start
             self.retry_count = 0
             self.last_data_time = None
-            self.next_log_time = time.time() + max(0.1, float(self.config.gps_log_interval))
+            self.next_log_time = time.monotonic() + self.log_interval
             
             # Open log file
-            self.log_file = open(self.log_path, 'w')
-            self.log_file.write('[\n')  # Start JSON array
+            # Binary: records are ASCII JSON, so skip the text-encoding layer
+            self.log_file = open(self.log_path, 'wb', buffering=self.LOG_BUFFER_SIZE)
+            self._records_since_flush = 0
+            self._last_flush = time.monotonic()
+            self._last_logged = None
             
             # Start processing thread
             self.running = True
@@ -123,7 +167,6 @@ class GPSHandler:
             self.thread.join(timeout=5.0)
             
         if self.log_file:
-            self.log_file.write('\n]')  # Close JSON array
             self.log_file.close()
             
         if self.session:
@@ -133,29 +176,38 @@ class GPSHandler:
     
     def _process_loop(self):
         """Main GPS processing loop"""
-        first_entry = True
+        # Bound once; config is frozen and these are read per GPSD message
+        monotonic = time.monotonic
+        stop_is_set = self.stop_event.is_set
+        log_interval = self.log_interval
         try:
-            while self.running and not self.stop_event.is_set():
+            while self.running and not stop_is_set():
                 try:
                     # Read GPS data with timeout
                     if self.session.waiting(timeout=1.0):
                         report = self.session.next()
                         
-                        if report['class'] == 'TPV':
+                        if report.get('class') == 'TPV':
                             # Time-Position-Velocity report
                             self._update_from_tpv(report)
-                            self.last_data_time = time.time()
+                            now = monotonic()
+                            self.last_data_time = now
                             
                             # Log data
-                            now = time.time()
                             if self.next_log_time and now >= self.next_log_time:
-                                self._log_data(first_entry)
-                                first_entry = False
+                                self._log_data()
                                 # Keep a steady cadence even if we miss a tick
-                                self.next_log_time = now + max(0.1, float(self.config.gps_log_interval))
+                                self.next_log_time = now + log_interval
                     
+                    # Time-based flush runs every pass, so buffered records still
+                    # reach the card while parked (skipped fixes) or without data
+                    now = monotonic()
+                    if (self._records_since_flush
+                            and now - self._last_flush >= self.LOG_FLUSH_INTERVAL):
+                        self._flush_log(now)
+
                     # Check for stale data only after we have seen at least one report
-                    if self.last_data_time and (time.time() - self.last_data_time > 10.0):
+                    if self.last_data_time and (now - self.last_data_time > 10.0):
                         self.logger.warning("GPS data is stale, attempting recovery...")
                         if not self._recover():
                             break
@@ -170,30 +222,42 @@ class GPSHandler:
     
     def _update_from_tpv(self, report: Dict):
         """Update GPS data from TPV report"""
-        self.timestamp = report.get('time', None)
-        self.latitude = report.get('lat', 0.0)
-        self.longitude = report.get('lon', 0.0)
+        get = report.get
+        self.timestamp = get('time', None)
+        self.latitude = get('lat', 0.0)
+        self.longitude = get('lon', 0.0)
         
         # Speed in m/s, convert to mph and kph
-        speed_ms = report.get('speed', 0.0)
-        self.speed_kph = speed_ms * 3.6
-        self.speed_mph = speed_ms * 2.23694
+        speed_ms = get('speed', 0.0)
+        self.speed_kph = speed_ms * MS_TO_KPH
+        self.speed_mph = speed_ms * MS_TO_MPH
         
-        self.altitude = report.get('alt', 0.0)
-        self.heading = report.get('track', 0.0)
+        self.altitude = get('alt', 0.0)
+        self.heading = get('track', 0.0)
         
         # Fix quality
-        mode = report.get('mode', 0)
+        mode = get('mode', 0)
         self.has_fix = mode >= 2  # 2D or 3D fix
         self.fix_quality = mode
     
-    def _log_data(self, first_entry: bool):
-        """Log GPS data to file"""
+    def _log_data(self):
+        """Append the current GPS data to the log as one JSON line"""
         if not self.log_file:
             return
+
+        now = time.monotonic()
+        last = self._last_logged
+        if (last is not None
+                and now - self._last_logged_at < self.log_max_gap
+                and abs(self.latitude - last[0]) < self.STATIONARY_DEGREES
+                and abs(self.longitude - last[1]) < self.STATIONARY_DEGREES
+                and abs(self.speed_mph - last[2]) < self.STATIONARY_MPH):
+            return
+        self._last_logged = (self.latitude, self.longitude, self.speed_mph)
+        self._last_logged_at = now
             
         data = {
-            'timestamp': self.timestamp or datetime.now().isoformat(),
+            'timestamp': self.timestamp or _iso_utc(time.time()),
             'latitude': self.latitude,
             'longitude': self.longitude,
             'speed_mph': round(self.speed_mph, 2),
@@ -206,12 +270,22 @@ class GPSHandler:
         }
         
         try:
-            if not first_entry:
-                self.log_file.write(',\n')
-            json.dump(data, self.log_file, indent=2)
-            self.log_file.flush()
+            self.log_file.write((_encode_record(data) + '\n').encode('ascii'))
+            self._records_since_flush += 1
         except Exception as e:
             self.logger.error(f"Failed to log GPS data: {e}")
+            return
+        if self._records_since_flush >= self.LOG_FLUSH_RECORDS:
+            self._flush_log(now)
+
+    def _flush_log(self, now: float):
+        """Flush buffered log records to disk"""
+        self._records_since_flush = 0
+        self._last_flush = now
+        try:
+            self.log_file.flush()
+        except Exception as e:
+            self.logger.error(f"Failed to flush GPS log: {e}")
     
     def _recover(self) -> bool:
         """Attempt to recover GPS connection"""
@@ -234,7 +308,7 @@ class GPSHandler:
             self.session = gps.gps(mode=gps.WATCH_ENABLE | gps.WATCH_NEWSTYLE)
             self.retry_count = 0
             self.last_data_time = None
-            self.next_log_time = time.time() + max(0.1, float(self.config.gps_log_interval))
+            self.next_log_time = time.monotonic() + self.log_interval
             self.logger.info("GPS recovered successfully")
             return True
             
@@ -252,6 +326,12 @@ class GPSHandler:
             
         return self.speed_mph >= self.config.start_recording_speed_mph
     
+    def get_speed_mph(self) -> Optional[float]:
+        """Get current speed in MPH, or None without a fix"""
+        if not self.enabled or not self.has_fix:
+            return None
+        return self.speed_mph
+    
     def get_status(self) -> Dict:
         """Get current GPS status"""
         return {
@@ -0,0 +1,34 @@
+"""
+Frame rotation/flip transforms shared by the display backends
+"""
+
+import numpy as np
+
+
+def pack_transform(rotation, hflip, vflip, mirror_mode=False) -> int:
+    """Fold rotation/flip settings into a single transform code.
+
+    Bit 0 selects a 90 degree counter-clockwise rotation, bit 1 a horizontal
+    flip and bit 2 a vertical flip (both applied after the rotation). A 180
+    degree rotation is equivalent to flipping both axes and the mirror flip
+    cancels out hflip, so every combination reduces to one of eight codes.
+    """
+    k = (int(rotation or 0) % 360) // 90
+    h = bool(hflip) ^ bool(mirror_mode)
+    v = bool(vflip)
+    if k >= 2:
+        h, v = not h, not v
+    return (k & 1) | (h << 1) | (v << 2)
+
+
+# Indexed by pack_transform() code; every entry returns a numpy view.
+TRANSFORMS = (
+    lambda f: f,
+    lambda f: np.rot90(f),
+    lambda f: f[:, ::-1],
+    lambda f: np.rot90(f)[:, ::-1],
+    lambda f: f[::-1],
+    lambda f: np.rot90(f)[::-1],
+    lambda f: f[::-1, ::-1],
+    lambda f: np.rot90(f)[::-1, ::-1],
+)
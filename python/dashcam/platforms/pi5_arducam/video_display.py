@@ -13,6 +13,8 @@ from threading import Thread, Event, Lock
 from typing import Optional
 from PIL import Image, ImageDraw, ImageFont
 
+from dashcam.platforms.pi5_arducam.transform import TRANSFORMS, pack_transform
+
 
 def hide_cursor():
     """Hide the Linux virtual console cursor on tty0 (framebuffer)."""
@@ -58,6 +60,7 @@ class VideoDisplay:
         self.height = config.display_height
         self.fps = config.display_fps
         self.mirror_mode = config.display_mirror_mode
+        self._transform_code = self._resolve_transform_code()
 
         # Framebuffer
         self.fb_device = config.framebuffer_device if hasattr(config, 'framebuffer_device') else "/dev/fb0"
@@ -286,17 +289,7 @@ class VideoDisplay:
                 # applied we skip software rotation/flips to avoid double-transform.
                 t_start = time.time()
                 if not getattr(self, 'hw_transform_applied', False):
-                    try:
-                        cam_cfg = self.config.get_camera_config(self.config.display_camera_index)
-                        rotation = cam_cfg.get('rotation', 0)
-                        hflip = cam_cfg.get('hflip', False)
-                        vflip = cam_cfg.get('vflip', False)
-                    except Exception:
-                        rotation = 0
-                        hflip = False
-                        vflip = False
-
-                    frame = self._apply_transform(frame, rotation, hflip, vflip, mirror_mode=self.mirror_mode)
+                    frame = self._apply_transform(frame, self._transform_code)
                 t_after_transform = time.time()
                 if self._prof_enabled:
                     self._prof_transform += (t_after_transform - t_start) * 1000.0
@@ -304,7 +297,7 @@ class VideoDisplay:
                 # Add overlay if enabled. Use cached overlay rendered only
                 # when content changes (time second, GPS speed, REC state).
                 if self.config.overlay_enabled:
-                    now_sec = datetime.now().second
+                    now_sec = int(time.time())
                     with self._overlay_lock:
                         with self.gps_lock:
                             cs = self.current_speed
@@ -594,15 +587,9 @@ class VideoDisplay:
             vehicle = self.canbus_vehicle
 
         if vehicle is not None:
-            try:
-                if hasattr(vehicle, "get_stats"):
-                    stats = vehicle.get_stats()
-                    connected = bool(stats.get("connected", False))
-                    last_message_time = float(stats.get("last_message_time") or 0.0)
-            except Exception:
-                pass
-
-            if not connected and hasattr(vehicle, "canbus"):
+            # Read the link state straight off the bus: get_stats() builds the
+            # full stats and vehicle data dicts, far more than this needs
+            if hasattr(vehicle, "canbus"):
                 try:
                     bus = vehicle.canbus
                     connected = bool(getattr(bus, "connected", False))
@@ -610,6 +597,14 @@ class VideoDisplay:
                 except Exception:
                     pass
 
+            if not connected and hasattr(vehicle, "get_stats"):
+                try:
+                    stats = vehicle.get_stats()
+                    connected = bool(stats.get("connected", False))
+                    last_message_time = float(stats.get("last_message_time") or 0.0)
+                except Exception:
+                    pass
+
         now = time.time()
         if connected and last_message_time and now - last_message_time <= stale_timeout:
             return (connected_text, connected_color)
@@ -776,42 +771,31 @@ class VideoDisplay:
         # Text
         draw.text((x, y), text, font=font, fill=color)
 
-    def _apply_transform(self, frame: np.ndarray, rotation: int, hflip: bool, vflip: bool, mirror_mode: bool=False) -> np.ndarray:
-        """Apply rotation and flips to a numpy RGB frame using PIL transposes.
+    def _resolve_transform_code(self) -> int:
+        """Pack the display camera's rotation/flips and mirror mode once."""
+        try:
+            cam_cfg = self.config.get_camera_config(self.config.display_camera_index)
+            rotation = cam_cfg.get('rotation', 0)
+            hflip = cam_cfg.get('hflip', False)
+            vflip = cam_cfg.get('vflip', False)
+        except Exception:
+            rotation = 0
+            hflip = False
+            vflip = False
+        return pack_transform(rotation, hflip, vflip, self.mirror_mode)
+
+    def _apply_transform(self, frame: np.ndarray, code: int) -> np.ndarray:
+        """Apply a pack_transform() code to a numpy RGB frame.
 
-        Rotation is applied in degrees (0/90/180/270). Flips (hflip/vflip) are
-        applied after rotation. `mirror_mode` will apply an additional
-        horizontal flip (useful for mirror display).
+        The rotation and flips are folded into one table lookup that returns a
+        strided view, so no per-frame copies or branches are needed here.
         """
-        # Use NumPy operations for rotation/flips to avoid per-frame PIL conversions.
-        # This significantly reduces allocations and CPU on the Pi.
         try:
             if frame is None:
                 return frame
-
-            img = frame
-            # Ensure ndarray
-            if not isinstance(img, np.ndarray):
-                img = np.array(img)
-
-            # Normalize rotation (0/90/180/270)
-            r = int(rotation or 0) % 360
-            if r != 0:
-                k = (r // 90) % 4
-                # np.rot90 rotates counter-clockwise k times
-                img = np.rot90(img, k=k)
-
-            if hflip:
-                img = np.fliplr(img)
-
-            if vflip:
-                img = np.flipud(img)
-
-            if mirror_mode:
-                img = np.fliplr(img)
-
-            return img
-
+            if not isinstance(frame, np.ndarray):
+                frame = np.array(frame)
+            return TRANSFORMS[code](frame)
         except Exception as e:
             self.logger.debug(f"Transform failed (numpy), falling back: {e}")
             return frame
@@ -23,6 +23,8 @@ import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 from numba import jit
 
+from dashcam.platforms.pi5_arducam.transform import TRANSFORMS, pack_transform
+
 
 # ---------------------------------------------------------------------------
 # DRM/KMS definitions (ctypes bindings to libdrm)
@@ -272,6 +274,7 @@ class DrmKmsDisplay:
 
         # Whether the capture path already applied rotation/flip in hardware
         self.hw_transform_applied = False
+        self._transform_code = self._resolve_transform_code()
 
         # Profiling and FPS tracking (glass-to-glass style markers)
         self._prof_enabled = True
@@ -595,25 +598,7 @@ class DrmKmsDisplay:
 
                 if not self.hw_transform_applied:
                     t_tf_start = time.time()
-                    try:
-                        cam_cfg = self.config.get_camera_config(
-                            getattr(self.config, "display_camera_index", 1)
-                        )
-                        rotation = cam_cfg.get("rotation", 0)
-                        hflip = cam_cfg.get("hflip", False)
-                        vflip = cam_cfg.get("vflip", False)
-                    except Exception:
-                        rotation = getattr(self.config, "rear_camera_rotation", 0)
-                        hflip = getattr(self.config, "rear_camera_hflip", False)
-                        vflip = getattr(self.config, "rear_camera_vflip", False)
-
-                    frame = self._apply_transform(
-                        frame,
-                        rotation,
-                        hflip,
-                        vflip,
-                        getattr(self.config, "display_mirror_mode", False),
-                    )
+                    frame = self._apply_transform(frame, self._transform_code)
                     t_tf_end = time.time()
                     if self._prof_enabled:
                         self._prof_transform += (t_tf_end - t_tf_start) * 1000.0
@@ -711,7 +696,7 @@ class DrmKmsDisplay:
         """
         render_ms = 0.0
         blend_ms = 0.0
-        now_sec = datetime.now().second
+        now_sec = int(time.time())
         with self._overlay_lock:
             with self.gps_lock:
                 cs = self.current_speed
@@ -924,15 +909,9 @@ class DrmKmsDisplay:
             vehicle = self.canbus_vehicle
 
         if vehicle is not None:
-            try:
-                if hasattr(vehicle, "get_stats"):
-                    stats = vehicle.get_stats()
-                    connected = bool(stats.get("connected", False))
-                    last_message_time = float(stats.get("last_message_time") or 0.0)
-            except Exception:
-                pass
-
-            if not connected and hasattr(vehicle, "canbus"):
+            # Read the link state straight off the bus: get_stats() builds the
+            # full stats and vehicle data dicts, far more than this needs
+            if hasattr(vehicle, "canbus"):
                 try:
                     bus = vehicle.canbus
                     connected = bool(getattr(bus, "connected", False))
@@ -940,6 +919,14 @@ class DrmKmsDisplay:
                 except Exception:
                     pass
 
+            if not connected and hasattr(vehicle, "get_stats"):
+                try:
+                    stats = vehicle.get_stats()
+                    connected = bool(stats.get("connected", False))
+                    last_message_time = float(stats.get("last_message_time") or 0.0)
+                except Exception:
+                    pass
+
         now = time.time()
         if connected and last_message_time and now - last_message_time <= stale_timeout:
             return (connected_text, connected_color)
@@ -1109,24 +1096,32 @@ class DrmKmsDisplay:
         col_idx = np.clip(col_idx, 0, src_w - 1)
         return frame[row_idx[:, None], col_idx]
 
-    def _apply_transform(self, frame: np.ndarray, rotation: int, hflip: bool, vflip: bool, mirror_mode: bool = False) -> np.ndarray:
+    def _resolve_transform_code(self) -> int:
+        try:
+            cam_cfg = self.config.get_camera_config(
+                getattr(self.config, "display_camera_index", 1)
+            )
+            rotation = cam_cfg.get("rotation", 0)
+            hflip = cam_cfg.get("hflip", False)
+            vflip = cam_cfg.get("vflip", False)
+        except Exception:
+            rotation = getattr(self.config, "rear_camera_rotation", 0)
+            hflip = getattr(self.config, "rear_camera_hflip", False)
+            vflip = getattr(self.config, "rear_camera_vflip", False)
+        return pack_transform(
+            rotation,
+            hflip,
+            vflip,
+            getattr(self.config, "display_mirror_mode", False),
+        )
+
+    def _apply_transform(self, frame: np.ndarray, code: int) -> np.ndarray:
         try:
             if frame is None:
                 return frame
-            img = frame
-            if not isinstance(img, np.ndarray):
-                img = np.array(img)
-            r = int(rotation or 0) % 360
-            if r != 0:
-                k = (r // 90) % 4
-                img = np.rot90(img, k=k)
-            if hflip:
-                img = np.fliplr(img)
-            if vflip:
-                img = np.flipud(img)
-            if mirror_mode:
-                img = np.fliplr(img)
-            return img
+            if not isinstance(frame, np.ndarray):
+                frame = np.array(frame)
+            return TRANSFORMS[code](frame)
         except Exception:
             return frame
 
@@ -204,7 +204,7 @@ class CameraRecorder:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"{self.prefix}_{timestamp}_{self.video_counter:04d}.h264"
         self.video_counter += 1
-        return os.path.join(self.config.video_current_dir, filename)
+        return self.config.video_current_prefix + filename
 
     def start_recording(self):
         """Start H.264 hardware recording from this camera"""
@@ -260,9 +260,9 @@ class CameraRecorder:
 
             # Archive the file
             if self.current_output_file and os.path.exists(self.current_output_file):
-                archive_path = os.path.join(
-                    self.config.video_archive_dir,
-                    os.path.basename(self.current_output_file)
+                archive_path = (
+                    self.config.video_archive_prefix
+                    + os.path.basename(self.current_output_file)
                 )
                 shutil.move(self.current_output_file, archive_path)
                 file_size_mb = os.path.getsize(archive_path) / (1024 * 1024)
@@ -601,10 +601,11 @@ class VideoRecorder:
         """Delete oldest archived H.264 files"""
         try:
             archive_dir = self.config.video_archive_dir
+            archive_prefix = self.config.video_archive_prefix
             files = []
 
             for filename in os.listdir(archive_dir):
-                filepath = os.path.join(archive_dir, filename)
+                filepath = archive_prefix + filename
                 if os.path.isfile(filepath) and filename.endswith(".h264"):
                     mtime = os.path.getmtime(filepath)
                     files.append((mtime, filepath))
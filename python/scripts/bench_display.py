@@ -14,7 +14,7 @@ import logging
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from dashcam.platforms.pi5_arducam.video_display import VideoDisplay
-from dashcam.core.config import config as default_config
+from dashcam.core.config import get_config
 
 logging.basicConfig(level=logging.INFO)
 
@@ -40,7 +40,7 @@ def read_proc_self_utime_stime_ticks():
     return utime + stime
 
 # Prepare config copy to avoid mutating global unexpectedly
-config = default_config
+config = get_config()
 # Use framebuffer -> /dev/null to avoid permission issues
 config.framebuffer_device = '/dev/null'
 
@@ -14,7 +14,7 @@ import numpy as np
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from dashcam.core.config import config as default_config
+from dashcam.core.config import get_config
 from dashcam.platforms.pi5_arducam.video_display_drmkms import DrmKmsDisplay
 
 logging.basicConfig(level=logging.INFO)
@@ -39,7 +39,7 @@ def make_test_frame(width: int, height: int, t: float) -> np.ndarray:
 
 
 def main():
-    config = default_config
+    config = get_config()
     config.display_backend = "drm"
     card_path = getattr(config, "display_drm_card", "/dev/dri/card1")
 
@@ -300,7 +300,8 @@ class GPSSetupTest:
         
         try:
             sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
-            from dashcam.core.config import config
+            from dashcam.core.config import get_config
+            config = get_config()
             
             self.check(
                 "GPS enabled in config",